@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+
+# Küpün boyutları; kenar çubuğu filtreleriyle aynı kategorik sütunlar
+CUBE_DIMENSIONS = ["Species_TR", "Region_TR", "Migration_Start_Month_TR"]
+
+# Sonuç sütunlarında "olumlu" sayılan değerler
+SUCCESS_VALUE = "Successful"
+INTERRUPTED_VALUE = "Yes"
+
+# Her hücrede tutulan toplamlar. *_known sayıları, oranların paydasıdır (durumu boş olan kayıtlar sayılmaz).
+MEASURES = ["count", "distance_sum", "distance_count", "success", "success_known", "interrupted", "interrupted_known"]
+
+
+def _dimension_codes(values):
+    # Kategorik sütunda kategori sırası korunur; diğer sütunlar sıralı benzersiz değerlere kodlanır.
+    # Eksik değerler son dilime düşer (etiketi None).
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy().astype(np.int64)
+        labels = values.cat.categories.tolist()
+    else:
+        codes, uniques = pd.factorize(values, sort=True)
+        codes = codes.astype(np.int64)
+        labels = list(uniques)
+    codes[codes < 0] = len(labels)
+    return codes, labels + [None]
+
+
+def _flag(df, col, value):
+    # (olumlu mu, durumu biliniyor mu) maskeleri; sütun yoksa hiçbir kaydın durumu bilinmez
+    if col not in df.columns:
+        known = np.zeros(len(df), dtype=bool)
+        return known, known
+    values = df[col]
+    return (values == value).to_numpy(dtype=bool, na_value=False), values.notna().to_numpy()
+
+
+def build_cube(df, dimensions=CUBE_DIMENSIONS):
+    # Boyutların tüm kombinasyonları için toplamlar tek geçişte (hücre kimliği başına bincount) hesaplanır.
+    # Veri kümesi başına bir kez kurulur; filtre kombinasyonları satır taraması yerine küp dilimlenerek yanıtlanır.
+    dimensions = [col for col in dimensions if col in df.columns]
+    labels = {}
+    cell_ids = np.zeros(len(df), dtype=np.int64)
+    for col in dimensions:
+        codes, labels[col] = _dimension_codes(df[col])
+        cell_ids = cell_ids * len(labels[col]) + codes
+    shape = tuple(len(labels[col]) for col in dimensions)
+    n_cells = int(np.prod(shape, dtype=np.int64))
+
+    def total(weights=None):
+        return np.bincount(cell_ids, weights=weights, minlength=n_cells).reshape(shape)
+
+    distance = df["Flight_Distance_km"].to_numpy(dtype=np.float64) if "Flight_Distance_km" in df.columns else np.full(len(df), np.nan)
+    distance_known = ~np.isnan(distance)
+    success, success_known = _flag(df, "Migration_Success", SUCCESS_VALUE)
+    interrupted, interrupted_known = _flag(df, "Migration_Interrupted", INTERRUPTED_VALUE)
+
+    measures = {
+        "count": total(),
+        "distance_sum": total(np.where(distance_known, distance, 0.0)),
+        "distance_count": total(distance_known),
+        "success": total(success),
+        "success_known": total(success_known),
+        "interrupted": total(interrupted),
+        "interrupted_known": total(interrupted_known),
+    }
+    # bincount ağırlıklı toplamları float döndürür; sayımlar tam sayıya çevrilir
+    for name in MEASURES:
+        if name != "distance_sum":
+            measures[name] = measures[name].astype(np.int64)
+    return {"dimensions": dimensions, "labels": labels, "measures": measures}
+
+
+def _merged_labels(base, delta):
+    # Eksik değer dilimi (None) her zaman sonda kalır. Eklenen satırların kategorileri mevcutları
+    # kapsıyorsa (birleştirilmiş kategorik sütun) onların sırası, değilse mevcut sıra + yeni etiketler.
+    if set(base) <= set(delta):
+        return delta
+    return base[:-1] + [label for label in delta[:-1] if label not in base] + [None]
+
+
+def merge_cubes(base, delta):
+    # İki küpün hücre toplamları birleştirilir (ör. mevcut veri kümesi + eklenen satırlardan kurulan küp).
+    # Etiketler farklıysa her iki küp de birleşik etiketlere yerleştirilir; maliyet hücre sayısıyla orantılıdır.
+    dimensions = base["dimensions"]
+    labels = {col: _merged_labels(base["labels"][col], delta["labels"][col]) for col in dimensions}
+    shape = tuple(len(labels[col]) for col in dimensions)
+
+    def placement(cube):
+        return np.ix_(*[
+            np.asarray([labels[col].index(label) for label in cube["labels"][col]], dtype=np.int64)
+            for col in dimensions
+        ])
+
+    base_at, delta_at = placement(base), placement(delta)
+    measures = {}
+    for name, values in base["measures"].items():
+        merged = np.zeros(shape, dtype=values.dtype)
+        merged[base_at] += values
+        merged[delta_at] += delta["measures"][name]
+        measures[name] = merged
+    return {"dimensions": dimensions, "labels": labels, "measures": measures}
+
+
+def slice_cube(cube, selections):
+    # selections: {boyut: seçilen değerler}; boş seçim boyutun tamamını alır (filter_index ile aynı anlam).
+    # Dönen küp, seçilen dilimleri içeren aynı yapıdadır.
+    indexers = []
+    labels = {}
+    for col in cube["dimensions"]:
+        selected = selections.get(col)
+        col_labels = cube["labels"][col]
+        if selected:
+            wanted = set(selected)
+            keep = [i for i, label in enumerate(col_labels) if label in wanted]
+        else:
+            keep = list(range(len(col_labels)))
+        indexers.append(np.asarray(keep, dtype=np.int64))
+        labels[col] = [col_labels[i] for i in keep]
+    grid = np.ix_(*indexers)
+    return {
+        "dimensions": cube["dimensions"],
+        "labels": labels,
+        "measures": {name: values[grid] for name, values in cube["measures"].items()},
+    }
+
+
+def _with_rates(frame):
+    frame["success_rate"] = frame["success"] / frame["success_known"].where(frame["success_known"] > 0)
+    frame["mean_distance_km"] = frame["distance_sum"] / frame["distance_count"].where(frame["distance_count"] > 0)
+    frame["interrupted_rate"] = frame["interrupted"] / frame["interrupted_known"].where(frame["interrupted_known"] > 0)
+    return frame
+
+
+def cube_totals(cube):
+    # Dilimin tamamı için toplamlar ve oranlar (tek satırlık sözlük)
+    totals = pd.DataFrame({name: [values.sum()] for name, values in cube["measures"].items()})
+    return _with_rates(totals).iloc[0].to_dict()
+
+
+def cube_summary(cube, by):
+    # Bir ya da iki boyuta göre gruplanmış toplamlar ve oranlar; kaydı olmayan gruplar atılır
+    by = [by] if isinstance(by, str) else list(by)
+    axes = tuple(i for i, col in enumerate(cube["dimensions"]) if col not in by)
+    remaining = [col for col in cube["dimensions"] if col in by]
+    order = [remaining.index(col) for col in by]
+    columns = {}
+    for name, values in cube["measures"].items():
+        columns[name] = np.transpose(values.sum(axis=axes), order).ravel()
+    index = pd.MultiIndex.from_product([cube["labels"][col] for col in by], names=by)
+    frame = pd.DataFrame(columns, index=index)
+    frame = frame[frame["count"] > 0]
+    # Eksik değerlerin dilimi (etiketi None) yalnızca kaydı varsa gösterilir
+    return _with_rates(frame).reset_index()
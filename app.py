@@ -1,9 +1,12 @@
 import streamlit as st
-import pandas as pd
-import pydeck as pdk
-import io
-import numpy as np
-import joblib
+import json
+import os
+import time
+import uuid
+
+import instrumentation
+from dataset_store import DatasetStore
+from model_loader import ModelLoader, active_model
 
 # Sayfa Yapılandırması
 st.set_page_config(
@@ -17,6 +20,15 @@ st.set_page_config(
     }
 )
 
+# Her yeniden çalıştırma, oturum kimliğiyle birlikte ayrı bir iz olarak ölçülür (bkz. instrumentation.py)
+if "trace_session_id" not in st.session_state:
+    st.session_state.trace_session_id = uuid.uuid4().hex[:8]
+instrumentation.begin_rerun(st.session_state.trace_session_id)
+
+# Performans paneli yalnızca KUSGOCU_DEBUG=1 ya da ?debug=1 ile gösterilir
+DEBUG_PANEL_RERUNS = 20
+show_debug_panel = os.environ.get("KUSGOCU_DEBUG") == "1" or st.query_params.get("debug") == "1"
+
 # Tema renkleri - Orman Teması
 FOREST_BACKGROUND = "#F5F5DC"  # Kremsi, hafif bej
 FOREST_PRIMARY = "#556B2F"      # Koyu Zeytin Yeşili (Ana yazı rengi ve bazı elementler için)
@@ -99,91 +111,30 @@ st.markdown(f"""
     </style>
     """, unsafe_allow_html=True)
 
-# Veri işleme fonksiyonu (harita için)
-@st.cache_data
-def process_data(df_input):
-    with st.spinner("Veriler işleniyor ve harita için hazırlanıyor..."):
-        df = df_input.copy()
-
-        # Harita için gerekli sütunların kontrolü
-        required_coords = ["Start_Latitude", "Start_Longitude", "End_Latitude", "End_Longitude", "Flight_Distance_km"]
-        if not all(col in df.columns for col in required_coords):
-            st.error("Harita oluşturmak için gerekli koordinat ve mesafe sütunları (Başlangıç Enlem, Başlangıç Boylam, Bitiş Enlem, Bitiş Boylam, Uçuş Mesafesi) yüklenen dosyada bulunamadı. Lütfen dosyanızı kontrol edin.")
-            return pd.DataFrame() # Boş DataFrame döndür
-
-        for col in ["Start_Latitude", "Start_Longitude", "End_Latitude", "End_Longitude", "Flight_Distance_km"]:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-
-        df.dropna(subset=["Start_Latitude", "Start_Longitude", "End_Latitude", "End_Longitude"], inplace=True)
-
-        # Harita filtrelemesi ve tooltip için Türkçe çeviriler
-        # Eğer bu sütunlar yoksa 'Bilinmiyor' atayalım, böylece hata vermez.
-        df['Migration_Start_Month_TR'] = df.get('Migration_Start_Month', 'Unknown').astype(str).apply(lambda x: x.split(',')[0].strip()).map({
-            "Jan": "Ocak", "Feb": "Şubat", "Mar": "Mart", "Apr": "Nisan", "May": "Mayıs", "Jun": "Haziran",
-            "Jul": "Temmuz", "Aug": "Ağustos", "Sep": "Eylül", "Oct": "Ekim", "Nov": "Kasım", "Dec": "Aralık"
-        }).fillna("Bilinmeyen Ay")
-        month_order_tr = ["Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran",
-                          "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"]
-        df["Migration_Start_Month_TR"] = pd.Categorical(df["Migration_Start_Month_TR"], categories=month_order_tr, ordered=True)
-
-        df['Species_TR'] = df.get('Species', 'Unknown').map({
-            "Stork": "Leylek", "Warder": "Balıkçı", "Crane": "Turna", "Hawk": "Şahin",
-            "Goose": "Kaz", "Eagle": "Kartal", "Owl": "Baykuş", "Robin": "Kızılgerdan",
-            "Sparrow": "Serçe", "Seagull": "Martı", "Pelican": "Pelikan", "Duck": "Ördek",
-            "Pigeon": "Güvercin", "Crow": "Karga", "Penguin": "Penguen", "Ostrich": "Devekuşu",
-            "Kiwi": "Kivi", "Parrot": "Papağan", "Flamingo": "Flamingo", "Swan": "Kuğu",
-            "Falcon": "Atmaca", "Vulture": "Akbaba", "Hummingbird": "Sinekkuşu",
-            "Woodpecker": "Ağaçkakan", "Kingfisher": "Yalıçapkını", "Osprey": "Balık Kartalı",
-            "Albatross": "Albatros", "Condor": "Kondor", "Macaw": "Ara", "Canary": "Kanarya",
-            "Quail": "Bıldırcın", "Raven": "Kuzgun", "Rooster": "Horoz", "Sandpiper": "Kumkuşu",
-            "Skylark": "Tarlakuşu", "Starling": "Sığırcık", "Swallow": "Kırlangıç", "Toucan": "Tukan",
-            "Turkey": "Hindi", "Wren": "Çitkuşu", "Puffin": "Deniz Papağanı", "Cormorant": "Karabatak",
-            "Heron": "Balıkçıl", "Ibis": "İbis", "Plover": "Kıyı Kuşu", "Teal": "Çamurcun",
-            "Wagtail": "Kuyruksallayan", "Woodcock": "Çulluk", "Pipit": "İncirkuşu",
-            "Other": "Diğer", "Unknown": "Bilinmeyen"
-        }).fillna("Bilinmeyen Tür")
-
-        df['Region_TR'] = df.get('Region', 'Unknown').map({
-            "North America": "Kuzey Amerika", "South America": "Güney Amerika", "Europe": "Avrupa",
-            "Asia": "Asya", "Africa": "Afrika", "Oceania": "Okyanusya", "Arctic": "Arktik",
-            "Antarctic": "Antarktika", "Grassland": "Otlak", "Forest": "Orman", "Urban": "Kentsel",
-            "Coastal": "Kıyı", "Wetland": "Sulak Alan", "Mountain": "Dağlık Bölge", "Desert": "Çöl",
-            "Tundra": "Tundra", "Tropikal": "Tropikal", "Temperate": "Ilıman", "Polar": "Kutup",
-            "Continental": "Kıtasal", "Ada": "Ada", "Denizel": "Denizel", "Riverine": "Nehir Kıyısı",
-            "Savanna": "Savana", "Steppe": "Step", "Taiga": "Tayga", "Subtropical": "Subtropikal",
-            "Mediterranean": "Akdeniz", "Boreal": "Boreal", "Alpine": "Alpin",
-            "Other": "Diğer", "Unknown": "Bilinmeyen"
-        }).fillna("Bilinmeyen Bölge")
-
-        df['Migration_Reason_TR'] = df.get('Migration_Reason', 'Unknown').map({
-            "Feeding": "Beslenme", "Breeding": "Üreme", "Climate": "İklim Koşulları",
-            "Shelter": "Barınma", "Predator Avoidance": "Avcıdan Kaçınma",
-            "Climate Change": "İlim Değişikliği", "Resource Scarcity": "Kaynak Kıtlığı",
-            "Nesting Site": "Yuvalama Alanı", "Safety": "Güvenlik",
-            "Seasonal Change": "Mevsimsel Değişim", "Food Availability": "Yiyecek Bulunabilirliği",
-            "Water Availability": "Su Bulunabilirliği", "Habitat Loss": "Habitat Kaybı",
-            "Other": "Diğer", "Unknown": "Bilinmeyen"
-        }).fillna("Bilinmeyen Neden")
-
-        df["Start_Coords_TR"] = df.apply(lambda row: f"Enlem: {row['Start_Latitude']:.2f}, Boylam: {row['Start_Longitude']:.2f}", axis=1)
-        df["End_Coords_TR"] = df.apply(lambda row: f"Enlem: {row['End_Latitude']:.2f}, Boylam: {row['End_Longitude']:.2f}", axis=1)
-
-        return df
-
 # --- Makine Öğrenimi Pipeline'ını Yükleme ---
-@st.cache_resource
-def load_prediction_pipeline():
-    try:
-        pipeline = joblib.load('logistic_model_9_features_5k_samples.pkl')
-        return pipeline
-    except FileNotFoundError:
-        st.error("❗ **Hata:** 'logistic_model_9_features_5k_samples.pkl' model dosyası bulunamadı. Lütfen model dosyasını uygulamanın aynı dizinine yüklediğinizden emin olun.")
-        st.stop()
-    except Exception as e:
-        st.error(f"❗ **Hata:** Model Pipeline'ı yüklenirken beklenmeyen bir sorun oluştu: {e}")
-        st.stop()
-
-prediction_pipeline = load_prediction_pipeline()
+# Model ilk oturumda arka planda yüklenir, derlenir ve örnek bir tahminle ısıtılır (bkz. model_loader.py).
+# Sayfa bu sırada çizilir; tahmin bölümleri model hazır olana kadar "hazırlanıyor" durumunu gösterir.
+# train_model.py --publish ile yeni bir model yayınlandığında (yol ya da değişiklik zamanı değişir) yeni model
+# sunucu yeniden başlatılmadan arka planda yüklenir; oturum, yeni model hazır olana kadar öncekini kullanır.
+# Yüklenemeyen model, yalnızca kendi önbellek girdisi silinerek en erken bu kadar saniye sonra yeniden denenir
+MODEL_RETRY_SECONDS = 30
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_prediction_model(model_path=None, model_mtime=None):
+    instrumentation.cache_miss("load_prediction_model")
+    return ModelLoader(model_path).start()
+
+prediction_model_key = active_model()
+with instrumentation.cache_lookup("load_prediction_model"):
+    prediction_model = load_prediction_model(*prediction_model_key)
+
+pending_prediction_model = None
+previous_prediction_model = st.session_state.get("prediction_model")
+if (prediction_model is not previous_prediction_model and previous_prediction_model is not None
+        and previous_prediction_model.scorer is not None and (not prediction_model.ready or prediction_model.error is not None)):
+    pending_prediction_model, prediction_model = prediction_model, previous_prediction_model
+else:
+    st.session_state.prediction_model = prediction_model
 
 # --- Ana Uygulama Akışı ---
 st.title("🦅 Kuş Göç Yolları Analizi ve Tahmini")
@@ -201,10 +152,197 @@ uploaded_file = st.sidebar.file_uploader(
     type=["csv"],
     help="Lütfen 'Species', 'Region', 'Migration_Start_Month', 'Migration_Reason', 'Start_Latitude', 'Start_Longitude', 'End_Latitude', 'End_Longitude', 'Flight_Distance_km' sütunlarını içeren bir CSV dosyası yükleyin."
 )
+# Günlük takip verileri tüm dosyayı yeniden yüklemeden eklenir; yalnızca yeni dosyalar okunur ve işlenir
+delta_files = st.sidebar.file_uploader(
+    "Yeni Kayıtları Ekle (.csv)",
+    type=["csv"],
+    accept_multiple_files=True,
+    disabled=uploaded_file is None,
+    key="delta_files",
+    help="Yüklenen veri kümesine aynı sütunlara sahip yeni takip kayıtları ekler. Dosyalar yüklendikleri sırayla eklenir; 'Bird_ID' değeri mevcut kayıtlarla aynı olan satırlar atlanır."
+)
+
+# Başlık ve dosya yükleyici çizildi; ağır kütüphaneler bundan sonra içe aktarılır
+instrumentation.mark("first_paint")
+
+with instrumentation.span("imports"):
+    import pandas as pd
+    import pydeck as pdk
+    import altair as alt
+    import numpy as np
+
+    import dataset_cache
+    from dataset_append import append_dataset, build_id_index, combine_fingerprints
+    from filter_index import apply_filters, build_filter_index, column_values, extend_filter_index, value_counts
+    from ingest import read_migration_csv
+    from lod import LOD_ROW_THRESHOLD, aggregate_arcs
+    from payload import CompactDeck, build_arc_layer, build_arc_payload
+    from prediction import (
+        PROBABILITY_COLUMN, flock_map, input_data_columns, months_map, predict_record,
+        region_map, score_csv, sensitivity_grid, species_map, weather_condition_map
+    )
+    from spatial_index import build_spatial_index, extend_spatial_index, query_bbox, query_radius
+    from aggregate_cube import build_cube, cube_summary, cube_totals, merge_cubes, slice_cube
+    from processing import REQUIRED_COORDS, add_coord_labels, memory_report, process_frame
+
+# Veri işleme fonksiyonu (harita için)
+def process_data(df_input):
+    with st.spinner("Veriler işleniyor ve harita için hazırlanıyor..."):
+        # Harita için gerekli sütunların kontrolü
+        if not all(col in df_input.columns for col in REQUIRED_COORDS):
+            st.error("Harita oluşturmak için gerekli koordinat ve mesafe sütunları (Başlangıç Enlem, Başlangıç Boylam, Bitiş Enlem, Bitiş Boylam, Uçuş Mesafesi) yüklenen dosyada bulunamadı. Lütfen dosyanızı kontrol edin.")
+            return pd.DataFrame() # Boş DataFrame döndür
+
+        # Çeviriler kategorik kodlar üzerinden, koordinat etiketleri vektörel olarak üretilir (bkz. processing.py)
+        return process_frame(df_input)
+
+# İşlenmiş veri kümeleri tüm oturumlarca paylaşılır: aynı dosyayı yükleyen oturumlar tek bir salt okunur
+# DataFrame'i kullanır, hiçbir oturumun tutmadığı veri kümesi bellekten atılır (bkz. dataset_store.py).
+# Okuma st.cache_* dışında yapılır, böylece ilerleme çubuğu ve hata mesajları her seferinde doğru gösterilir.
+@st.cache_resource
+def shared_dataset_store():
+    return DatasetStore()
+
+# Yüklenen dosyanın işlenmiş hali: önce diskteki Arrow önbelleğinde aranır, yoksa okunup işlenir.
+# Anahtar ham baytların özeti olduğundan DataFrame her yeniden çalıştırmada hash'lenmez.
+def load_dataset(fingerprint, uploaded_file, progress=None):
+    with instrumentation.span("dataset_cache.load"):
+        cached = dataset_cache.load_cached(fingerprint)
+    if cached is not None:
+        instrumentation.count("load_dataset.disk_hit")
+        return cached, []
+
+    instrumentation.count("load_dataset.miss")
+    # Dosya parça parça ve yalnızca gerekli sütunlarla okunur (bkz. ingest.py)
+    with instrumentation.span("ingest") as span_attrs:
+        df_raw, ingest_issues = read_migration_csv(uploaded_file, progress=progress)
+        span_attrs["rows"] = len(df_raw)
+    with instrumentation.span("process"):
+        df = process_data(df_raw)
+    if not df.empty:
+        with instrumentation.span("dataset_cache.store"):
+            dataset_cache.store(fingerprint, df)
+    return df, ingest_issues
+
+# Eklenen dosyaların işlenmiş hali: mevcut veri kümesine yalnızca yeni satırlar işlenerek eklenir,
+# kurulmuş indeksler ve özet küpü yeni satırlarla genişletilir (bkz. dataset_append.py)
+def load_appended(base_handle, delta_file):
+    instrumentation.count("load_dataset.append")
+    with instrumentation.span("ingest", file=delta_file.name) as span_attrs:
+        delta_raw, delta_issues = read_migration_csv(delta_file)
+        span_attrs["rows"] = len(delta_raw)
+    with instrumentation.span("process"):
+        delta_df = process_data(delta_raw)
+    id_index = base_handle.derived("id_index", build_id_index)
+    with instrumentation.span("append") as span_attrs:
+        df, derived = append_dataset(base_handle.df, {**base_handle.built_derived(), "id_index": id_index}, delta_df, DERIVED_EXTENDERS)
+        span_attrs["rows"] = derived["append_log"][-1]["rows_added"]
+    issues = base_handle.issues + [{**issue, "file": delta_file.name} for issue in delta_issues]
+    return df, issues, derived
+
+# Oturum, paylaşılan veri kümesine yalnızca bir referans (handle) tutar. Dosya değiştiğinde ya da
+# kaldırıldığında referans bırakılır; oturum kapandığında session_state ile birlikte bırakılır.
+# Eklenen her dosya, önceki veri kümesinin ve dosyanın özetinden türeyen yeni bir veri kümesidir; oturum
+# zincirin bir kısmını zaten tutuyorsa yalnızca kalan dosyalar eklenir. Veri kümesine eklenmiş dosyalar da
+# döndürülür (okunamayan dosyada zincir durur).
+def acquire_dataset(fingerprint, uploaded_file, delta_files=(), progress=None):
+    chain = [fingerprint]
+    for delta_file in delta_files:
+        chain.append(combine_fingerprints(chain[-1], dataset_cache.fingerprint_upload(delta_file)))
+
+    handle = st.session_state.get("dataset_handle")
+    if handle is not None and handle.released:
+        handle = None
+    if handle is not None and handle.fingerprint == chain[-1]:
+        instrumentation.count("load_dataset.session_hit")
+        return handle, [], list(delta_files)
+    if handle is not None and handle.fingerprint in chain:
+        start = chain.index(handle.fingerprint)
+    else:
+        release_dataset()
+        handle = shared_dataset_store().acquire(fingerprint, lambda: load_dataset(fingerprint, uploaded_file, progress))
+        if not handle.loaded:
+            instrumentation.count("load_dataset.memory_hit")
+        if handle.df.empty:
+            # İşlenemeyen dosya depoda tutulmaz
+            handle.release()
+            return handle, [], []
+        st.session_state.dataset_handle = handle
+        start = 0
+
+    append_errors = []
+    for i in range(start, len(delta_files)):
+        base_handle = handle
+        try:
+            handle = shared_dataset_store().acquire(chain[i + 1], lambda: load_appended(base_handle, delta_files[i]))
+        except Exception as e:
+            # Okunamayan dosyadan sonrakiler de eklenmez; veri kümesi son başarılı eklemede kalır
+            append_errors.append((delta_files[i].name, e))
+            break
+        if not handle.loaded:
+            instrumentation.count("load_dataset.memory_hit")
+        base_handle.release()
+        st.session_state.dataset_handle = handle
+    return handle, append_errors, list(delta_files[:chain.index(handle.fingerprint)])
+
+def release_dataset():
+    handle = st.session_state.pop("dataset_handle", None)
+    if handle is not None:
+        handle.release()
+
+# Kenar çubuğu filtreleri için bit eşlem indeksi, veri kümesi başına bir kez kurulur ve veri kümesiyle
+# birlikte paylaşılır (bkz. filter_index.py)
+def build_shared_filter_index(df):
+    instrumentation.cache_miss("load_filter_index")
+    return build_filter_index(df)
+
+# Tür × bölge × ay özet küpü, veri kümesi başına bir kez kurulur (bkz. aggregate_cube.py)
+def build_shared_cube(df):
+    instrumentation.cache_miss("load_aggregate_cube")
+    return build_cube(df)
+
+# Konum filtresi için başlangıç/bitiş noktalarının ızgara indeksi; ilk konum sorgusunda kurulur (bkz. spatial_index.py)
+def build_shared_spatial_index(df):
+    instrumentation.cache_miss("load_spatial_index")
+    return build_spatial_index(df)
+
+# Yeni kayıtlar eklenirken kurulmuş yapılar baştan kurulmaz, yalnızca yeni satırlarla genişletilir
+DERIVED_EXTENDERS = {
+    "filter_index": extend_filter_index,
+    "spatial_index": extend_spatial_index,
+    "aggregate_cube": lambda cube, rows: merge_cubes(cube, build_cube(rows)),
+}
+
+# Duyarlılık analizinde taranabilen girdiler: (etiket, en küçük, en büyük, adım).
+# Sıcaklık ve rüzgar kaydırıcı adımlarıyla taranır; basınç için 0.1 yerine 0.5 adım kullanılır.
+sensitivity_axes = {
+    'Temperature_C': ('Sıcaklık (°C)', -15.0, 40.0, 0.5),
+    'Wind_Speed_kmh': ('Rüzgar Hızı (km/s)', 0.0, 80.0, 0.5),
+    'Pressure_hPa': ('Basınç (hPa)', 980.0, 1040.0, 0.5),
+}
+
+# Taranmayan girdilerin değerleri önbellek anahtarıdır; taranan kaydırıcıların değişmesi ızgarayı yeniden hesaplatmaz
+# model_fingerprint önbellek anahtarının parçasıdır; yeni bir model yayınlandığında eski modelin ızgaraları kullanılmaz
+@st.cache_data(show_spinner=False, max_entries=64)
+def compute_sensitivity(fixed_inputs, axis_columns, model_fingerprint):
+    instrumentation.cache_miss("compute_sensitivity")
+    axes = {}
+    for col in axis_columns:
+        _, low, high, step = sensitivity_axes[col]
+        axes[col] = np.round(np.arange(low, high + step / 2, step), 2)
+    start = time.perf_counter()
+    grid = sensitivity_grid(prediction_scorer, dict(fixed_inputs), axes)
+    return grid, time.perf_counter() - start
+
+# Model hazırsa derlenmiş skorlayıcı (ya da sklearn pipeline'ı), değilse None
+prediction_scorer = prediction_model.scorer if prediction_model.ready else None
 
 df_map = pd.DataFrame() # Harita için kullanılacak DataFrame
+dataset_fingerprint = None # Yüklenen dosyanın içerik özeti (önbellek ve indeks anahtarı)
+batch_sources = [] # Toplu tahminde skorlanan dosyalar: yüklenen dosya ve veri kümesine eklenmiş dosyalar
 
 if uploaded_file is None:
+    release_dataset()
     st.info("Devam etmek için lütfen sol panelden bir CSV dosyası yükleyin (Harita ve Tablo Görünümü için).")
     # Eğer dosya yüklenmediyse, varsayılan olarak boş bir DataFrame oluşturup,
     # sadece tahmin bölümü için varsayılan seçenekleri kullanacağız.
@@ -217,13 +355,49 @@ if uploaded_file is None:
     # df_map = df_dummy # Varsayılan veri ile başlamak isterseniz bu satırı yorumdan çıkarabilirsiniz.
 else:
     try:
-        df_raw = pd.read_csv(io.BytesIO(uploaded_file.getvalue()))
-        df_map = process_data(df_raw)
+        progress_bar = st.sidebar.progress(0.0, text="Dosya okunuyor...")
+        def report_progress(fraction, rows_read):
+            progress_bar.progress(fraction, text=f"Dosya okunuyor... ({rows_read:,} satır)")
+
+        with instrumentation.span("fingerprint"):
+            dataset_fingerprint = dataset_cache.fingerprint_upload(uploaded_file)
+        with instrumentation.span("load_dataset") as span_attrs:
+            dataset_handle, append_errors, appended_files = acquire_dataset(dataset_fingerprint, uploaded_file, delta_files or [], report_progress)
+            batch_sources = [uploaded_file, *appended_files]
+            df_map, ingest_issues = dataset_handle.df, dataset_handle.issues
+            span_attrs["rows"] = len(df_map)
+        progress_bar.empty()
+
+        for file_name, error in append_errors:
+            st.sidebar.error(f"❗ **Hata:** '{file_name}' dosyasındaki kayıtlar eklenemedi: `{error}`")
+
+        if ingest_issues:
+            with st.sidebar.expander(f"⚠️ {len(ingest_issues)} parçada hatalı satır bulundu"):
+                for issue in ingest_issues:
+                    if "file" in issue:
+                        st.write(f"**{issue['file']}**")
+                    if "error" in issue:
+                        st.write(f"Parça {issue['chunk']} ({issue['first_row']}. satırdan itibaren): okuma durduruldu — `{issue['error']}`")
+                        continue
+                    prefix = f"Parça {issue['chunk']} ({issue['first_row']}. satırdan itibaren)"
+                    if issue["invalid_rows"]:
+                        columns = ", ".join(
+                            [f"{col} ({count})" for col, count in issue["columns"].items()]
+                            + [f"{col} boş ({count})" for col, count in issue["missing"].items()]
+                        )
+                        st.write(f"{prefix}: {issue['invalid_rows']} satırda geçersiz değer — {columns}")
+                    if issue["skipped_lines"]:
+                        st.write(f"{prefix}: alan sayısı hatalı {issue['skipped_lines']} satır atlandı")
+                        for line in issue["lines"]:
+                            st.caption(f"{line['line']}. satır: {line['actual']} alan (beklenen {line['expected']}) — `{line['text']}`")
 
         if df_map.empty:
             st.sidebar.error("Yüklenen CSV dosyasında işlenebilecek veri bulunamadı veya işleme sırasında hata oluştu.")
         else:
             st.sidebar.success("Veri başarıyla yüklendi ve işlendi!")
+            for step in dataset_handle.built_derived().get("append_log", []):
+                duplicates = f", {step['duplicates_skipped']:,} yinelenen kayıt atlandı" if step["deduplicated"] else ", yinelenen kayıt denetimi yapılamadı (Bird_ID yok)"
+                st.sidebar.caption(f"➕ {step['rows_added']:,} yeni kayıt eklendi{duplicates} — {step['seconds'] * 1000:.0f} ms")
 
     except pd.errors.EmptyDataError:
         st.sidebar.error("❗ **Hata:** Yüklenen CSV dosyası boş.")
@@ -236,6 +410,9 @@ else:
 # --- HARİTA VE FİLTRELEME BÖLÜMÜ ---
 # Harita bölümünü, df_map boş değilse gösteriyoruz.
 if not df_map.empty and all(col in df_map.columns for col in ["Start_Latitude", "Start_Longitude", "End_Latitude", "End_Longitude"]):
+    with instrumentation.cache_lookup("load_filter_index"):
+        map_filter_index = dataset_handle.derived("filter_index", build_shared_filter_index)
+
     st.sidebar.header("🗺️ Harita Görselleştirme Filtreleri")
     st.sidebar.markdown("Göç verilerini harita üzerinde detaylandırmak için aşağıdaki filtreleri kullanın.")
 
@@ -247,7 +424,7 @@ if not df_map.empty and all(col in df_map.columns for col in ["Start_Latitude",
     with col2:
         clear_species = st.button("Seçimi Temizle", key="clear_species_btn_map")
 
-    all_species_tr = sorted(df_map["Species_TR"].unique())
+    all_species_tr = column_values(map_filter_index, "Species_TR")
     if "species_selected_tr" not in st.session_state:
         st.session_state.species_selected_tr = []
 
@@ -275,7 +452,7 @@ if not df_map.empty and all(col in df_map.columns for col in ["Start_Latitude",
     with col4:
         clear_regions = st.button("Seçimi Temizle", key="clear_regions_btn_map")
 
-    all_regions_tr = sorted(df_map["Region_TR"].unique())
+    all_regions_tr = column_values(map_filter_index, "Region_TR")
     if "region_selected_tr" not in st.session_state:
         st.session_state.region_selected_tr = []
 
@@ -298,7 +475,9 @@ if not df_map.empty and all(col in df_map.columns for col in ["Start_Latitude",
     # Göç Başlangıç Ayı Seçimi
     st.sidebar.subheader("Göç Başlangıç Ayı")
     all_months_tr = df_map["Migration_Start_Month_TR"].cat.categories.tolist() if "Migration_Start_Month_TR" in df_map.columns else []
-    default_month_index = all_months_tr.index(df_map["Migration_Start_Month_TR"].mode()[0]) if not df_map["Migration_Start_Month_TR"].empty and "Migration_Start_Month_TR" in df_map.columns else 0
+    # Varsayılan ay en sık görülen ay; sayımlar indeksten okunur
+    month_counts = value_counts(map_filter_index, "Migration_Start_Month_TR")
+    default_month_index = all_months_tr.index(max(month_counts, key=month_counts.get)) if month_counts else 0
 
     start_month_tr = st.sidebar.selectbox(
         "Göç Başlangıç Ayı",
@@ -307,68 +486,256 @@ if not df_map.empty and all(col in df_map.columns for col in ["Start_Latitude",
         help="Göç hareketini gözlemlemek istediğiniz başlangıç ayını seçin. Tek bir ay seçimi haritayı sadeleştirebilir."
     )
 
-    filtered_map_data = df_map.copy()
-    if species_selected_tr:
-        filtered_map_data = filtered_map_data[filtered_map_data["Species_TR"].isin(species_selected_tr)]
-    if region_selected_tr:
-        filtered_map_data = filtered_map_data[filtered_map_data["Region_TR"].isin(region_selected_tr)]
-    if start_month_tr:
-        filtered_map_data = filtered_map_data[filtered_map_data["Migration_Start_Month_TR"] == start_month_tr]
+    st.sidebar.markdown("---") # Ayırıcı ekle
+
+    # Konum Filtresi: uç noktası bir dikdörtgen alanda ya da bir noktanın çevresinde kalan göçler
+    st.sidebar.subheader("Konum Filtresi")
+    spatial_mode = st.sidebar.selectbox(
+        "Alan",
+        ["Yok", "Dikdörtgen Alan", "Nokta Çevresi"],
+        help="Başlangıç ya da bitiş noktası seçilen alanda kalan göçleri gösterir. Diğer filtrelerle birlikte uygulanır."
+    )
+    spatial_positions = None
+    if spatial_mode != "Yok":
+        endpoint_labels = {"either": "Başlangıç veya Bitiş", "start": "Başlangıç", "end": "Bitiş", "both": "Başlangıç ve Bitiş"}
+        spatial_endpoint = st.sidebar.selectbox("Uç Nokta", list(endpoint_labels), format_func=endpoint_labels.get)
+        col_a, col_b = st.sidebar.columns(2)
+        if spatial_mode == "Dikdörtgen Alan":
+            lat_min = col_a.number_input("En Küçük Enlem", min_value=-90.0, max_value=90.0, value=35.0, step=1.0)
+            lat_max = col_b.number_input("En Büyük Enlem", min_value=-90.0, max_value=90.0, value=72.0, step=1.0)
+            lon_min = col_a.number_input("Batı Boylamı", min_value=-180.0, max_value=180.0, value=-25.0, step=1.0,
+                                         help="Batı boylamı doğu boylamından büyükse alan 180. meridyeni geçer.")
+            lon_max = col_b.number_input("Doğu Boylamı", min_value=-180.0, max_value=180.0, value=45.0, step=1.0)
+        else:
+            center_lat = col_a.number_input("Merkez Enlem", min_value=-90.0, max_value=90.0, value=41.0, step=0.5)
+            center_lon = col_b.number_input("Merkez Boylam", min_value=-180.0, max_value=180.0, value=29.0, step=0.5)
+            radius_km = st.sidebar.number_input("Yarıçap (km)", min_value=1.0, max_value=20_000.0, value=500.0, step=50.0)
+
+        with instrumentation.cache_lookup("load_spatial_index"):
+            map_spatial_index = dataset_handle.derived("spatial_index", build_shared_spatial_index)
+        with instrumentation.span("spatial.query", mode=spatial_endpoint) as span_attrs:
+            if spatial_mode == "Dikdörtgen Alan":
+                spatial_positions = query_bbox(map_spatial_index, lat_min, lat_max, lon_min, lon_max, endpoint=spatial_endpoint)
+            else:
+                spatial_positions = query_radius(map_spatial_index, center_lat, center_lon, radius_km, endpoint=spatial_endpoint)
+            span_attrs["rows"] = len(spatial_positions)
+
+    st.sidebar.markdown("---") # Ayırıcı ekle
+
+    # Harita Ayrıntı Düzeyi
+    st.sidebar.subheader("Harita Ayrıntı Düzeyi")
+    map_zoom = st.sidebar.slider(
+        "Yakınlaştırma",
+        min_value=0.5, max_value=8.0, value=1.5, step=0.5,
+        help="Haritanın başlangıç yakınlaştırması. Büyük sonuçlarda yayları birleştiren ızgaranın çözünürlüğünü de belirler."
+    )
+    lod_threshold = st.sidebar.number_input(
+        "Toplulaştırma Eşiği (kayıt)",
+        min_value=1000, max_value=10_000_000, value=LOD_ROW_THRESHOLD, step=1000,
+        help="Gösterilecek kayıt sayısı bu eşiği aşarsa, aynı başlangıç ve bitiş hücresini paylaşan yaylar tek bir yayda birleştirilir. Birleştirilmiş yay sayısı da bu eşiği geçmez."
+    )
+
+    # Filtreler tam kopya ve sütun taraması yerine bit eşlem kesişimi ve tek bir take ile uygulanır;
+    # konum sorgusunun sıralı satır konumları bu seçimle kesiştirilir
+    with instrumentation.span("filter") as span_attrs:
+        filtered_map_data = apply_filters(df_map, map_filter_index, {
+            "Species_TR": species_selected_tr,
+            "Region_TR": region_selected_tr,
+            "Migration_Start_Month_TR": [start_month_tr] if start_month_tr else [],
+        }, positions=spatial_positions)
+        span_attrs["rows"] = len(filtered_map_data)
 
     st.markdown(f"**📈 Gösterilen Toplam Göç Kaydı:** `{len(filtered_map_data)}`")
 
     if filtered_map_data.empty:
         st.warning("⚠️ **Uyarı:** Seçilen filtre kriterlerine göre hiç göç kaydı bulunamadı. Lütfen filtrelerinizi değiştirerek daha geniş bir seçim yapmayı deneyin.")
-        st.info("İpucu: Daha fazla sonuç görmek için 'Kuş Türü' veya 'Bölge' filtrelerindeki tüm seçenekleri işaretleyebilirsiniz.")
+        st.info("İpucu: Daha fazla sonuç görmek için 'Kuş Türü' veya 'Bölge' filtrelerindeki tüm seçenekleri işaretleyebilir ya da konum filtresinin alanını genişletebilirsiniz.")
     else:
         # Harita merkezini sadece geçerli koordinatlar varsa ayarla
         if not filtered_map_data[["Start_Latitude", "Start_Longitude"]].isnull().all().all():
             view_state = pdk.ViewState(
                 latitude=filtered_map_data["Start_Latitude"].mean(),
                 longitude=filtered_map_data["Start_Longitude"].mean(),
-                zoom=1.5,
+                zoom=map_zoom,
                 pitch=0,
                 bearing=0
             )
         else:
             view_state = pdk.ViewState(latitude=0, longitude=0, zoom=1) # Varsayılan konum
 
-        arc_layer = pdk.Layer(
-            "ArcLayer",
-            data=filtered_map_data,
-            get_source_position=["Start_Longitude", "Start_Latitude"],
-            get_target_position=["End_Longitude", "End_Latitude"],
-            get_source_color=[0, 150, 0, 160], # Kaynak rengi: Koyu yeşil
-            get_target_color=[160, 82, 45, 160], # Hedef rengi: Kahverengi
-            auto_highlight=True,
-            width_scale=0.0001,
-            width_min_pixels=1,
-            get_width="Flight_Distance_km",
-            pickable=True
-        )
+        # Büyük sonuçlarda her kayıt ayrı yay olarak gönderilmez; ızgara üzerinde birleştirilir (bkz. lod.py)
+        if len(filtered_map_data) > lod_threshold:
+            with instrumentation.span("lod") as span_attrs:
+                arc_data = aggregate_arcs(filtered_map_data, map_zoom, max_arcs=lod_threshold)
+                span_attrs["arcs"] = len(arc_data)
+            width_column = "Arc_Width"
+            tooltip_html = (
+                "<b>Birleştirilmiş Yay:</b> {Arc_Count} kayıt<br/>"
+                "<b>Baskın Tür:</b> {Species_TR} (toplam {Species_Count} tür)<br/>"
+                "<b>Ortalama Mesafe:</b> {Flight_Distance_km} km<br/>"
+                "<b>Baskın Neden:</b> {Migration_Reason_TR}<br/>"
+                "<b>Başlangıç Konumu (ort.):</b> {Start_Coords_TR}<br/>"
+                "<b>Hedef Konumu (ort.):</b> {End_Coords_TR}"
+            )
+            st.caption(f"Kayıt sayısı eşiği aştığı için {len(filtered_map_data)} göç kaydı {len(arc_data)} birleştirilmiş yay olarak gösteriliyor.")
+        else:
+            arc_data = filtered_map_data
+            width_column = "Flight_Distance_km"
+            tooltip_html = (
+                "<b>Tür:</b> {Species_TR}<br/>"
+                "<b>Mesafe:</b> {Flight_Distance_km} km<br/>"
+                "<b>Neden:</b> {Migration_Reason_TR}<br/>"
+                "<b>Başlangıç Konumu:</b> {Start_Coords_TR}<br/>"
+                "<b>Hedef Konumu:</b> {End_Coords_TR}"
+            )
 
-        st.pydeck_chart(pdk.Deck(
+        # Tarayıcıya yalnızca katman ve tooltip sütunları kısa adlarla gönderilir (bkz. payload.py)
+        with instrumentation.span("payload", arcs=len(arc_data)):
+            arc_payload, tooltip_html = build_arc_payload(arc_data, width_column, tooltip_html)
+            arc_layer = build_arc_layer(
+                arc_payload,
+                get_source_color=[0, 150, 0, 160], # Kaynak rengi: Koyu yeşil
+                get_target_color=[160, 82, 45, 160], # Hedef rengi: Kahverengi
+                auto_highlight=True,
+                width_scale=0.0001,
+                width_min_pixels=1,
+                pickable=True
+            )
+
+        map_deck = CompactDeck(
             layers=[arc_layer],
             initial_view_state=view_state,
             map_style="mapbox://styles/mapbox/satellite-v9", # Google Earth benzeri uydu görüntüsü
-            tooltip={
-                "html": (
-                    "<b>Tür:</b> {Species_TR}<br/>"
-                    "<b>Mesafe:</b> {Flight_Distance_km} km<br/>"
-                    "<b>Neden:</b> {Migration_Reason_TR}<br/>"
-                    "<b>Başlangıç Konumu:</b> {Start_Coords_TR}<br/>"
-                    "<b>Hedef Konumu:</b> {End_Coords_TR}"
-                )
-            }
-        ))
+            tooltip={"html": tooltip_html}
+        )
+        # Deck'in JSON serileştirmesi st.pydeck_chart içinde yapılır
+        with instrumentation.span("map.render") as span_attrs:
+            st.pydeck_chart(map_deck)
+            if map_deck.payload_stats:
+                span_attrs["bytes"] = map_deck.payload_stats["bytes"]
+                span_attrs["serialize_ms"] = round(map_deck.payload_stats["seconds"] * 1000, 1)
+        if map_deck.payload_stats:
+            st.caption(f"Harita verisi: {map_deck.payload_stats['bytes'] / 1024:,.0f} KB, serileştirme {map_deck.payload_stats['seconds'] * 1000:.0f} ms")
 
         st.subheader("Tablo Görünümü")
         st.markdown("Haritada gösterilen göç verilerinin detaylı listesi:")
-        st.dataframe(filtered_map_data.head(100), use_container_width=True)
+        with instrumentation.span("table"):
+            st.dataframe(add_coord_labels(filtered_map_data.head(100)), use_container_width=True)
+
+    # --- ÖZET İSTATİSTİKLER ---
+    # Kenar çubuğu filtreleri önceden hesaplanmış küpün dilimlenmesiyle yanıtlanır; satırlar yeniden taranmaz.
+    # Konum filtresi küpün bir boyutu olmadığından, etkinse küp yalnızca filtrelenmiş kayıtlar için kurulur.
+    st.subheader("📊 Özet İstatistikler")
+    with instrumentation.span("summary") as span_attrs:
+        if spatial_positions is None:
+            with instrumentation.cache_lookup("load_aggregate_cube"):
+                map_cube = dataset_handle.derived("aggregate_cube", build_shared_cube)
+            summary_cube = slice_cube(map_cube, {
+                "Species_TR": species_selected_tr,
+                "Region_TR": region_selected_tr,
+                "Migration_Start_Month_TR": [start_month_tr] if start_month_tr else [],
+            })
+            span_attrs["source"] = "cube"
+        else:
+            summary_cube = build_cube(filtered_map_data)
+            span_attrs["source"] = "rows"
+        summary_totals = cube_totals(summary_cube)
+
+    col_count, col_success, col_distance, col_interrupted = st.columns(4)
+    col_count.metric("Kayıt", f"{int(summary_totals['count']):,}")
+    col_success.metric("Başarı Oranı", "—" if pd.isna(summary_totals["success_rate"]) else f"{summary_totals['success_rate']:.1%}")
+    col_distance.metric("Ortalama Mesafe", "—" if pd.isna(summary_totals["mean_distance_km"]) else f"{summary_totals['mean_distance_km']:,.0f} km")
+    col_interrupted.metric("Kesintiye Uğrayan", f"{int(summary_totals['interrupted']):,}")
+    if not summary_totals["success_known"]:
+        st.caption("Yüklenen dosyada 'Migration_Success' ve 'Migration_Interrupted' sütunları bulunmadığı için başarı ve kesinti değerleri hesaplanamadı.")
+
+    if summary_totals["count"]:
+        summary_labels = {"Species_TR": "Kuş Türü", "Region_TR": "Bölge"}
+        summary_options = {"Kuş Türü": ["Species_TR"], "Bölge": ["Region_TR"], "Kuş Türü × Bölge": ["Species_TR", "Region_TR"]}
+        summary_by = summary_options[st.radio("Gruplama", list(summary_options), horizontal=True, key="summary_by")]
+        summary_table = cube_summary(summary_cube, summary_by)
+
+        success_title = "Başarı Oranı"
+        tooltip = [alt.Tooltip(col, title=summary_labels[col]) for col in summary_by] + [
+            alt.Tooltip("count", title="Kayıt", format=","),
+            alt.Tooltip("success_rate", title=success_title, format=".1%"),
+            alt.Tooltip("mean_distance_km", title="Ortalama Mesafe (km)", format=",.0f"),
+            alt.Tooltip("interrupted", title="Kesintiye Uğrayan", format=","),
+        ]
+        if len(summary_by) == 1:
+            summary_chart = alt.Chart(summary_table).mark_bar(color=FOREST_ACCENT_GREEN).encode(
+                x=alt.X(f"{summary_by[0]}:N", title=summary_labels[summary_by[0]], sort="-y", axis=alt.Axis(labelAngle=0)),
+                y=alt.Y("success_rate:Q", title=success_title, axis=alt.Axis(format="%")),
+                tooltip=tooltip
+            )
+        else:
+            summary_chart = alt.Chart(summary_table).mark_rect().encode(
+                x=alt.X(f"{summary_by[1]}:N", title=summary_labels[summary_by[1]], axis=alt.Axis(labelAngle=0)),
+                y=alt.Y(f"{summary_by[0]}:N", title=summary_labels[summary_by[0]]),
+                color=alt.Color("success_rate:Q", title=success_title, scale=alt.Scale(scheme="redyellowgreen"), legend=alt.Legend(format="%")),
+                tooltip=tooltip
+            )
+        st.altair_chart(summary_chart, use_container_width=True)
+
+        st.dataframe(pd.DataFrame({
+            **{summary_labels[col]: summary_table[col] for col in summary_by},
+            "Kayıt": summary_table["count"],
+            "Başarılı": summary_table["success"],
+            "Başarı Oranı (%)": (summary_table["success_rate"] * 100).round(1),
+            "Ortalama Mesafe (km)": summary_table["mean_distance_km"].round(1),
+            "Kesintiye Uğrayan": summary_table["interrupted"],
+            "Kesinti Oranı (%)": (summary_table["interrupted_rate"] * 100).round(1),
+        }), hide_index=True, use_container_width=True)
 else:
     st.warning("Harita ve tablo görünümü için geçerli kuş göçü verisi yüklenemedi. Lütfen geçerli bir CSV dosyası yükleyin.")
 
 
+# --- TOPLU TAHMİN BÖLÜMÜ ---
+# Yüklenen dosyanın ve veri kümesine eklenmiş dosyaların tamamı parça parça okunup modelle skorlanır
+# (bkz. prediction.score_csv)
+if batch_sources and prediction_scorer is not None:
+    st.subheader("📦 Toplu Göç Başarısı Tahmini")
+    st.markdown("Yüklenen dosyadaki ve sonradan eklenen dosyalardaki tüm göç kayıtlarını tahmin modeliyle skorlayın. Sonuçlar, her kayıt için başarı olasılığını içeren bir dosya olarak indirilebilir.")
+
+    batch_format = st.radio("Çıktı Biçimi", ["CSV", "Parquet"], horizontal=True, key="batch_format")
+    if st.button("Tüm Kayıtları Skorla", key="batch_score_button"):
+        batch_progress = st.progress(0.0, text="Kayıtlar skorlanıyor...")
+        def report_batch_progress(fraction, rows_done):
+            batch_progress.progress(fraction, text=f"Kayıtlar skorlanıyor... ({rows_done:,} satır)")
+
+        try:
+            with instrumentation.span("batch.score", format=batch_format) as span_attrs:
+                batch_data, batch_stats = score_csv(batch_sources[0], prediction_scorer, output_format=batch_format.lower(), progress=report_batch_progress, appended=batch_sources[1:])
+                span_attrs["rows"] = batch_stats["rows_scored"]
+            st.session_state.batch_scores = {"fingerprint": dataset_handle.fingerprint, "model": prediction_model.fingerprint, "format": batch_format, "data": batch_data, "stats": batch_stats}
+        except Exception as e:
+            st.error(f"❗ **Hata:** Toplu tahmin yapılırken bir sorun oluştu: {e}")
+        batch_progress.empty()
+
+    batch_scores = st.session_state.get("batch_scores")
+    # Sonuçlar yalnızca aynı veri kümesi (yüklenen ve eklenen dosyalar) ve aynı modelle skorlanmışsa gösterilir
+    # (dosya eklenince ya da model yenilenince eski sonuçlar indirilemez)
+    if batch_scores and batch_scores["fingerprint"] == dataset_handle.fingerprint and batch_scores["model"] == prediction_model.fingerprint:
+        batch_stats = batch_scores["stats"]
+        col_scored, col_speed, col_time = st.columns(3)
+        col_scored.metric("Skorlanan Kayıt", f"{batch_stats['rows_scored']:,}")
+        col_speed.metric("Hız (satır/sn)", f"{batch_stats['rows_per_second']:,.0f}")
+        col_time.metric("Süre", f"{batch_stats['seconds']:.2f} sn")
+        if batch_stats["files"] > 1:
+            st.caption(f"{batch_stats['files']} dosya skorlandı; eklenen dosyalarda mevcut kayıtlarla aynı 'Bird_ID' değerine sahip {batch_stats['rows_duplicate']:,} satır atlandı.")
+        if batch_stats["rows_skipped"]:
+            st.warning(f"⚠️ {batch_stats['rows_skipped']:,} kayıt eksik ya da geçersiz girdi nedeniyle skorlanamadı; bu kayıtların '{PROBABILITY_COLUMN}' değeri boş bırakıldı.")
+
+        extension = batch_scores["format"].lower()
+        st.download_button(
+            f"Sonuçları İndir (.{extension})",
+            data=batch_scores["data"],
+            file_name=f"goc_basarisi_tahminleri.{extension}",
+            mime="text/csv" if extension == "csv" else "application/octet-stream",
+            key="batch_download_button"
+        )
+
+
 # --- TAHMİN MODELİ BÖLÜMÜ ---
 st.sidebar.header("🔮 Göç Başarısı Tahmini")
 st.sidebar.markdown("Belirli koşullar altında kuş göçünün başarılı olup olmayacağını tahmin edin.")
@@ -398,39 +765,7 @@ with col2:
     wind_speed_kmh = st.slider('Rüzgar Hızı (km/s)', min_value=0.0, max_value=80.0, value=20.0, step=0.5)
 
 
-# MODELİN BEKLEDİĞİ 9 SÜTUNUN SIRASI
-input_data_columns = [
-    'Weather_Condition', 'Pressure_hPa', 'Migration_Start_Month',
-    'Species', 'Region', 'Migrated_in_Flock', 'Flight_Distance_km',
-    'Temperature_C', 'Wind_Speed_kmh'
-]
-
-# Girdi değerlerini modelin anlayacağı İngilizce formatına dönüştürme
-weather_condition_map = {'Güneşli': 'Sunny', 'Bulutlu': 'Cloudy', 'Yağmurlu': 'Rainy', 'Rüzgarlı': 'Windy', 'Sisli': 'Foggy'}
-species_map = {
-    'Leylek': 'Stork', 'Kaz': 'Goose', 'Turna': 'Crane', 'Şahin': 'Hawk',
-    'Kızılgerdan': 'Robin', 'Serçe': 'Sparrow', 'Kartal': 'Eagle', 'Baykuş': 'Owl',
-    'Pelikan': 'Pelican', 'Ördek': 'Duck'
-}
-region_map = {
-    "Kuzey Amerika": "North America", "Güney Amerika": "South America", "Avrupa": "Europe",
-    "Asya": "Asia", "Afrika": "Africa", "Okyanusya": "Oceania", "Arktik": "Arctic",
-    "Antarktika": "Antarctic", "Otlak": "Grassland", "Orman": "Forest", "Kentsel": "Urban",
-    "Kıyı": "Coastal", "Sulak Alan": "Wetland", "Dağlık Bölge": "Mountain", "Çöl": "Desert",
-    "Tundra": "Tundra", "Tropikal": "Tropical", "Ilıman": "Temperate", "Kutup": "Polar",
-    "Kıtasal": "Continental", "Ada": "Island", "Denizel": "Marine", "Nehir Kıyısı": "Riverine",
-    "Savana": "Savanna", "Steppe": "Steppe", "Tayga": "Taiga", "Subtropikal": "Subtropical",
-    "Akdeniz": "Mediterranean", "Boreal": "Boreal", "Alpine": "Alpine",
-    "Diğer": "Other", "Bilinmeyen": "Unknown"
-}
-months_map = {
-    "Ocak": "Jan", "Şubat": "Feb", "Mart": "Mar", "Nisan": "Apr", "Mayıs": "May", "Haziran": "Jun",
-    "Temmuz": "Jul", "Ağustos": "Aug", "Eylül": "Sep", "Ekim": "Oct", "Kasım": "Nov", "Aralık": "Dec"
-}
-flock_map = {'Evet': 'Yes', 'Hayır': 'No'}
-
-
-input_df_for_prediction = pd.DataFrame([[
+input_record_for_prediction = dict(zip(input_data_columns, [
     weather_condition_map.get(weather_condition_pred, weather_condition_pred),
     pressure_hpa,
     months_map.get(migration_start_month, migration_start_month),
@@ -440,31 +775,112 @@ input_df_for_prediction = pd.DataFrame([[
     flight_distance_km,
     temperature_c,
     wind_speed_kmh
-]], columns=input_data_columns)
+]))
 
 
-if st.sidebar.button('Göç Başarısını Tahmin Et', key='predict_button'):
-    if prediction_pipeline is not None:
-        try:
-            prediction = prediction_pipeline.predict(input_df_for_prediction)
-            prediction_proba = prediction_pipeline.predict_proba(input_df_for_prediction)
+# Model hazırlanırken tahmin düğmesi devre dışıdır; kenar çubuğu model hazır olana kadar yoklanır
+@st.fragment(run_every=0.5)
+def wait_for_prediction_model(model, message):
+    if model.ready:
+        st.rerun()
+    st.info(message)
 
-            st.sidebar.subheader("Tahmin Sonucu:")
-            if prediction[0] == 1:
-                st.sidebar.success(f'✅ **Göç Başarılı Olacak!** (Olasılık: {prediction_proba[0][1]*100:.2f}%)')
-            else:
-                st.sidebar.error(f'❌ **Göç Başarısız Olacak!** (Olasılık: {prediction_proba[0][0]*100:.2f}%)')
-            st.sidebar.info("Bu tahmin, 5000 sentetik veri örneği üzerinde eğitilmiş makine öğrenimi modeline dayanmaktadır.")
-        except Exception as e:
-            st.sidebar.error(f"Tahmin yapılırken bir hata oluştu: {e}")
-            st.sidebar.info("Lütfen tüm giriş alanlarını doğru bir şekilde doldurduğunuzdan ve modelin beklediği tüm özellikleri sağladığınızdan emin olun.")
-            st.sidebar.write(f"Hata detayı: {e}")
-            st.sidebar.write("Gönderilen input DataFrame sütunları:")
-            st.sidebar.write(input_df_for_prediction.columns.tolist())
-            st.sidebar.write("Gönderilen input DataFrame (ilk satır):")
-            st.sidebar.dataframe(input_df_for_prediction.head(1))
+if pending_prediction_model is not None:
+    if not pending_prediction_model.ready:
+        with st.sidebar:
+            wait_for_prediction_model(pending_prediction_model, "⏳ Yeni tahmin modeli hazırlanıyor... Hazır olana kadar önceki model kullanılıyor.")
+    else:
+        # Yeni model yüklenemezse önceki model kullanılmaya devam eder; yeni bir model yayınlanana kadar yeniden denenmez
+        st.sidebar.warning(f"Yeni tahmin modeli yüklenemedi, önceki model kullanılıyor: {pending_prediction_model.error}")
+
+if prediction_scorer is None:
+    if not prediction_model.ready:
+        with st.sidebar:
+            wait_for_prediction_model(prediction_model, "⏳ Tahmin modeli hazırlanıyor... Bu sırada haritayı ve tabloyu kullanabilirsiniz.")
     else:
+        if isinstance(prediction_model.error, FileNotFoundError):
+            st.sidebar.error("❗ **Hata:** 'logistic_model_9_features_5k_samples.pkl' model dosyası bulunamadı. Lütfen model dosyasını uygulamanın aynı dizinine yüklediğinizden emin olun.")
+        else:
+            st.sidebar.error(f"❗ **Hata:** Model Pipeline'ı yüklenirken beklenmeyen bir sorun oluştu: {prediction_model.error}")
         st.sidebar.warning("Tahmin modeli yüklenemediği için tahmin yapılamıyor.")
+        # Başarısız yükleme bir süre sonra yeniden denenir; yalnızca bu modelin girdisi silinir, önbellekteki
+        # diğer model (ör. başka oturumların kullandığı önceki model) korunur ve her çalıştırmada yeni yükleme başlamaz
+        if time.monotonic() - prediction_model.finished_at >= MODEL_RETRY_SECONDS:
+            load_prediction_model.clear(*prediction_model_key)
+
+if st.sidebar.button('Göç Başarısını Tahmin Et', key='predict_button', disabled=prediction_scorer is None):
+    try:
+        with instrumentation.span("predict"):
+            prediction, success_probability = predict_record(prediction_scorer, input_record_for_prediction)
+
+        st.sidebar.subheader("Tahmin Sonucu:")
+        if prediction == 1:
+            st.sidebar.success(f'✅ **Göç Başarılı Olacak!** (Olasılık: {success_probability*100:.2f}%)')
+        else:
+            st.sidebar.error(f'❌ **Göç Başarısız Olacak!** (Olasılık: {(1 - success_probability)*100:.2f}%)')
+        # Model bilgisi eğitim meta verisinden okunur; alanları eksik (elle konmuş ya da eski) modellerde genel açıklama gösterilir
+        model_info = prediction_model.metadata or {}
+        model_source = model_info.get("source")
+        model_metrics = model_info.get("test_metrics")
+        rows_used = model_source.get("rows_used") if isinstance(model_source, dict) else None
+        test_auc = model_metrics.get("roc_auc") if isinstance(model_metrics, dict) else None
+        if isinstance(rows_used, int) and isinstance(test_auc, (int, float)) and model_info.get("version"):
+            st.sidebar.info(f"Bu tahmin, {rows_used:,} göç kaydı üzerinde eğitilmiş makine öğrenimi modeline dayanmaktadır (sürüm {model_info['version']}, test ROC AUC {test_auc:.3f}).")
+        else:
+            st.sidebar.info("Bu tahmin, 5000 sentetik veri örneği üzerinde eğitilmiş makine öğrenimi modeline dayanmaktadır.")
+    except Exception as e:
+        st.sidebar.error(f"Tahmin yapılırken bir hata oluştu: {e}")
+        st.sidebar.info("Lütfen tüm giriş alanlarını doğru bir şekilde doldurduğunuzdan ve modelin beklediği tüm özellikleri sağladığınızdan emin olun.")
+        st.sidebar.write(f"Hata detayı: {e}")
+        st.sidebar.write("Gönderilen girdi sütunları:")
+        st.sidebar.write(list(input_record_for_prediction))
+        st.sidebar.write("Gönderilen girdi:")
+        st.sidebar.dataframe(pd.DataFrame([input_record_for_prediction]))
+
+
+# --- DUYARLILIK ANALİZİ BÖLÜMÜ ---
+# Kenar çubuğundaki diğer girdiler sabit tutularak bir ya da iki girdinin tüm aralığı tek seferde skorlanır
+if prediction_scorer is not None:
+    st.subheader("🎛️ Duyarlılık Analizi")
+    st.markdown("Kenar çubuğunda seçtiğiniz koşullar sabit tutulurken sıcaklık, rüzgar hızı ve basıncın göç başarısı olasılığını nasıl değiştirdiğini inceleyin.")
+
+    axis_labels = {col: spec[0] for col, spec in sensitivity_axes.items()}
+    col_x, col_y = st.columns(2)
+    sensitivity_x = col_x.selectbox("Yatay Eksen", options=list(sensitivity_axes), format_func=axis_labels.get, key="sensitivity_x")
+    y_options = [None] + [col for col in sensitivity_axes if col != sensitivity_x]
+    sensitivity_y = col_y.selectbox(
+        "Dikey Eksen", options=y_options, index=1,
+        format_func=lambda col: axis_labels.get(col, "Yok (çizgi grafik)"), key="sensitivity_y"
+    )
+
+    axis_columns = (sensitivity_x,) if sensitivity_y is None else (sensitivity_x, sensitivity_y)
+    fixed_inputs = tuple((col, value) for col, value in input_record_for_prediction.items() if col not in axis_columns)
+    with instrumentation.cache_lookup("compute_sensitivity", axes=" x ".join(axis_columns)):
+        sensitivity_data, sensitivity_seconds = compute_sensitivity(fixed_inputs, axis_columns, prediction_model.fingerprint)
+
+    probability_title = "Başarı Olasılığı"
+    if sensitivity_y is None:
+        sensitivity_chart = alt.Chart(sensitivity_data).mark_line().encode(
+            x=alt.X(f"{sensitivity_x}:Q", title=axis_labels[sensitivity_x]),
+            y=alt.Y(f"{PROBABILITY_COLUMN}:Q", title=probability_title, scale=alt.Scale(domain=[0, 1])),
+            tooltip=[sensitivity_x, alt.Tooltip(PROBABILITY_COLUMN, title=probability_title, format=".1%")]
+        )
+    else:
+        # Eksen etiketleri her 10 adımda bir gösterilir
+        x_ticks = sensitivity_data[sensitivity_x].unique()[::10].tolist()
+        y_ticks = sensitivity_data[sensitivity_y].unique()[::10].tolist()
+        sensitivity_chart = alt.Chart(sensitivity_data).mark_rect().encode(
+            x=alt.X(f"{sensitivity_x}:O", title=axis_labels[sensitivity_x], axis=alt.Axis(values=x_ticks, labelAngle=0)),
+            y=alt.Y(f"{sensitivity_y}:O", title=axis_labels[sensitivity_y], sort="descending", axis=alt.Axis(values=y_ticks)),
+            color=alt.Color(f"{PROBABILITY_COLUMN}:Q", title=probability_title, scale=alt.Scale(scheme="redyellowgreen", domain=[0, 1])),
+            tooltip=[sensitivity_x, sensitivity_y, alt.Tooltip(PROBABILITY_COLUMN, title=probability_title, format=".1%")]
+        )
+    with instrumentation.span("sensitivity.render", points=len(sensitivity_data)):
+        st.altair_chart(sensitivity_chart, use_container_width=True)
+    st.caption(f"{len(sensitivity_data):,} girdi kombinasyonu tek seferde {sensitivity_seconds * 1000:.0f} ms içinde skorlandı.")
+elif not prediction_model.ready:
+    st.subheader("🎛️ Duyarlılık Analizi")
+    st.info("⏳ Tahmin modeli hazırlanıyor; duyarlılık grafiği model hazır olduğunda burada gösterilecek.")
 
 # Yan Panel Alt Bilgisi
 st.sidebar.markdown("---")
@@ -473,4 +889,56 @@ st.sidebar.markdown("""
 Bu interaktif görselleştirme uygulaması, kuş göç yollarını kolayca keşfetmenizi ve göç başarısını tahmin etmenizi sağlar.
 Veri analizini daha erişilebilir kılmak için **Shneiderman'ın Kullanıcı Arayüzü Tasarım İlkeleri** dikkate alınmıştır.
 """)
-st.sidebar.info("Herhangi bir soru, öneri veya geri bildiriminiz için lütfen iletişime geçmekten çekinmeyin.")
\ No newline at end of file
+st.sidebar.info("Herhangi bir soru, öneri veya geri bildiriminiz için lütfen iletişime geçmekten çekinmeyin.")
+
+# --- PERFORMANS İZLEME PANELİ ---
+# İz, panel çizilmeden önce kapatılır; panel kendi çizim süresini içermez
+last_rerun = instrumentation.end_rerun()
+if show_debug_panel and last_rerun is not None:
+    with st.expander("🛠️ Performans İzleme", expanded=True):
+        st.markdown(f"**Son yeniden çalıştırma:** {last_rerun['duration_ms']:.0f} ms")
+        if prediction_model.ready:
+            st.caption(f"Model hazırlığı ({prediction_model.path}, arka plan, {prediction_model.source}): " + ", ".join(f"{key} {value:.0f}" for key, value in prediction_model.timings.items()))
+        st.dataframe(pd.DataFrame([
+            {
+                "Aşama": "\u2003" * s["depth"] + s["name"],
+                "Başlangıç (ms)": round(s["start_ms"], 1),
+                "Süre (ms)": round(s["duration_ms"], 1),
+                "Ayrıntı": ", ".join(f"{key}={value}" for key, value in s["attrs"].items()),
+            }
+            for s in last_rerun["spans"] if s["duration_ms"] is not None
+        ]), hide_index=True, use_container_width=True)
+
+        session_reruns = instrumentation.recent_reruns(st.session_state.trace_session_id, DEBUG_PANEL_RERUNS)
+        st.markdown(f"**Bu oturumun son {len(session_reruns)} yeniden çalıştırması** (üst düzey aşamalar, ms)")
+        rerun_rows = []
+        for rerun in reversed(session_reruns):
+            row = {"#": rerun["rerun_id"], "Zaman": time.strftime("%H:%M:%S", time.localtime(rerun["started_at"])), "Toplam": round(rerun["duration_ms"], 1)}
+            for s in rerun["spans"]:
+                if s["depth"] == 0 and s["duration_ms"] is not None:
+                    row[s["name"]] = round(row.get(s["name"], 0) + s["duration_ms"], 1)
+            rerun_rows.append(row)
+        st.dataframe(pd.DataFrame(rerun_rows), hide_index=True, use_container_width=True)
+
+        all_reruns = instrumentation.recent_reruns()
+        col_counters, col_summary = st.columns([1, 2])
+        col_counters.markdown("**Önbellek sayaçları (süreç geneli)**")
+        col_counters.dataframe(pd.DataFrame(list(instrumentation.counters().items()), columns=["Sayaç", "Değer"]), hide_index=True)
+        col_summary.markdown(f"**Aşama süre dağılımı** (tüm oturumlar, son {len(all_reruns)} çalıştırma)")
+        col_summary.dataframe(pd.DataFrame(instrumentation.summarize(all_reruns)).round(1), hide_index=True)
+
+        dataset_store = shared_dataset_store()
+        st.markdown("**Paylaşılan veri kümeleri** (" + ", ".join(f"{key} {value}" for key, value in dataset_store.stats.items()) + ")")
+        st.dataframe(pd.DataFrame(dataset_store.snapshot()).round(1), hide_index=True)
+        if not df_map.empty:
+            st.markdown(f"**Bu oturumun veri kümesi:** {df_map.memory_usage(deep=True).sum() / 2 ** 20:.2f} MB (sütun başına)")
+            st.dataframe(memory_report(df_map).round(3), use_container_width=True)
+
+        st.download_button(
+            "İzleri İndir (Chrome trace .json)",
+            data=json.dumps(instrumentation.to_chrome_trace(all_reruns), default=instrumentation.json_default),
+            file_name="kusgocu_trace.json",
+            mime="application/json",
+            key="trace_download_button",
+            help="chrome://tracing ya da https://ui.perfetto.dev ile açılabilir."
+        )
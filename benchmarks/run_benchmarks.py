@@ -0,0 +1,290 @@
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import joblib
+import numpy as np
+import pandas as pd
+import pyarrow.csv as pacsv
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dataset_append import append_dataset, build_id_index
+from filter_index import apply_filters, build_filter_index, column_values, extend_filter_index
+from ingest import read_migration_csv
+from lod import LOD_ROW_THRESHOLD, aggregate_arcs
+from payload import CompactDeck, build_arc_layer, build_arc_payload
+from prediction import MODEL_PATH, compile_pipeline, predict_record, score_csv, to_model_input
+from aggregate_cube import build_cube, cube_summary, cube_totals, merge_cubes, slice_cube
+from processing import process_frame
+from spatial_index import build_spatial_index, extend_spatial_index, query_bbox, query_radius
+from synthetic_data import generate_chunk, write_synthetic_csv
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+STAGES = [
+    'ingest', 'process', 'filter_index', 'filter', 'spatial_index', 'spatial_bbox', 'spatial_radius',
+    'cube', 'cube_query', 'append', 'lod', 'payload',
+    'predict_single', 'predict_single_sklearn', 'predict_batch', 'predict_batch_sklearn',
+]
+
+# Uygulamadaki ham yay tooltip'i ile aynı alanlar
+TOOLTIP_HTML = (
+    "<b>Tür:</b> {Species_TR}<br/>"
+    "<b>Mesafe:</b> {Flight_Distance_km} km<br/>"
+    "<b>Neden:</b> {Migration_Reason_TR}<br/>"
+    "<b>Başlangıç Konumu:</b> {Start_Coords_TR}<br/>"
+    "<b>Hedef Konumu:</b> {End_Coords_TR}"
+)
+MAP_ZOOM = 1.5
+# Uygulamadaki konum filtresinin varsayılanları: Avrupa kutusu ve İstanbul çevresinde 500 km
+SPATIAL_BBOX = (35.0, 72.0, -25.0, 45.0)
+SPATIAL_RADIUS = (41.0, 29.0, 500.0)
+# Eklenen dosya veri kümesinin bu oranı kadardır; yarısı mevcut kayıtlarla aynı Bird_ID'lere sahiptir
+APPEND_FRACTION = 0.01
+APPEND_EXTENDERS = {
+    'filter_index': extend_filter_index,
+    'spatial_index': extend_spatial_index,
+    'aggregate_cube': lambda cube, rows: merge_cubes(cube, build_cube(rows)),
+}
+
+# Tekil tahminler bu kadar kayıt üzerinden ortalanır (sklearn yolu çağrı başına ~15 ms sürer)
+SINGLE_PREDICTIONS = 2000
+SINGLE_PREDICTIONS_SKLEARN = 50
+
+# Bu süreden kısa ölçümler zamanlayıcı gürültüsüne açık olduğundan gerileme sayılmaz
+MIN_COMPARABLE_SECONDS = 0.01
+MIN_COMPARABLE_PEAK_MB = 1.0
+
+
+def measure(fn, repeat, memory):
+    # Süre en iyi `repeat` çalıştırmanın süresidir; bellek tepe değeri ayrı bir tracemalloc
+    # çalıştırmasıyla ölçülür, böylece izleme yükü süre ölçümüne karışmaz.
+    timings = []
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+
+    stats = {'seconds': min(timings)}
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        stats['peak_mb'] = peak / 2 ** 20
+    return result, stats
+
+
+def synthetic_csv(data_dir, n_rows, seed):
+    path = os.path.join(data_dir, f'migration_{n_rows}_{seed}.csv')
+    if not os.path.exists(path):
+        write_synthetic_csv(path, n_rows, seed=seed)
+    return path
+
+
+def _with_file(path, fn):
+    # Okuyucular uygulamadaki yüklenen dosya gibi aranabilir (seekable) bir dosya nesnesi bekler
+    with open(path, 'rb') as f:
+        return fn(f)
+
+
+def benchmark_size(path, n_rows, pipeline, scorer, stages, repeat, memory):
+    results = {}
+
+    def run(stage, fn, rows=n_rows, calls=None):
+        result, stats = measure(fn, repeat, memory)
+        if calls:
+            stats['seconds_per_call'] = stats['seconds'] / calls
+        stats['rows'] = rows
+        stats['rows_per_second'] = rows / stats['seconds'] if stats['seconds'] > 0 else None
+        if stage in stages:
+            results[stage] = stats
+        return result
+
+    # Sonraki aşamalar öncekilerin çıktısına ihtiyaç duyduğundan ingest ve process her zaman çalışır
+    raw = run('ingest', lambda: _with_file(path, read_migration_csv)[0])
+    df = run('process', lambda: process_frame(raw), rows=len(raw))
+    if 'process' in results:
+        results['process']['frame_mb'] = df.memory_usage(deep=True).sum() / 2 ** 20
+
+    if stages & {'filter_index', 'filter'}:
+        index = run('filter_index', lambda: build_filter_index(df), rows=len(df))
+        selections = {
+            'Species_TR': column_values(index, 'Species_TR')[:2],
+            'Region_TR': column_values(index, 'Region_TR')[:1],
+        }
+        run('filter', lambda: apply_filters(df, index, selections), rows=len(df))
+
+    if stages & {'cube', 'cube_query'}:
+        cube = run('cube', lambda: build_cube(df), rows=len(df))
+        selections = {'Species_TR': column_values(build_filter_index(df), 'Species_TR')[:2]}
+
+        def query_cube():
+            sliced = slice_cube(cube, selections)
+            return cube_totals(sliced), cube_summary(sliced, ['Species_TR', 'Region_TR'])
+        run('cube_query', query_cube, rows=len(df))
+
+    if stages & {'spatial_index', 'spatial_bbox', 'spatial_radius'}:
+        spatial = run('spatial_index', lambda: build_spatial_index(df), rows=len(df))
+        run('spatial_bbox', lambda: query_bbox(spatial, *SPATIAL_BBOX), rows=len(df))
+        run('spatial_radius', lambda: query_radius(spatial, *SPATIAL_RADIUS), rows=len(df))
+
+    if 'append' in stages:
+        # Uygulamadaki gibi yalnızca eklenen dosya okunur ve işlenir; indeksler ve küp genişletilir
+        n_delta = max(int(len(df) * APPEND_FRACTION), 1)
+        delta_csv = io.BytesIO()
+        pacsv.write_csv(generate_chunk(n_delta, first_id=len(df) - n_delta // 2, seed=(n_rows, 1)), delta_csv)
+        derived = {
+            'id_index': build_id_index(df),
+            'filter_index': build_filter_index(df),
+            'spatial_index': build_spatial_index(df),
+            'aggregate_cube': build_cube(df),
+        }
+
+        def append_delta():
+            delta_csv.seek(0)
+            delta_df = process_frame(read_migration_csv(delta_csv)[0])
+            return append_dataset(df, derived, delta_df, APPEND_EXTENDERS)
+        _, extended = run('append', append_delta, rows=n_delta)
+        if 'append' in results:
+            results['append']['rows_added'] = extended['append_log'][-1]['rows_added']
+
+    if stages & {'lod', 'payload'}:
+        arcs = run('lod', lambda: aggregate_arcs(df, MAP_ZOOM), rows=len(df))
+        # Uygulamadaki gibi eşiği aşan sonuçlarda toplulaştırılmış yaylar gönderilir
+        if len(df) > LOD_ROW_THRESHOLD:
+            arc_data, width_column = arcs, 'Arc_Width'
+        else:
+            arc_data, width_column = df, 'Flight_Distance_km'
+
+        def build_payload():
+            arc_payload, html = build_arc_payload(arc_data, width_column, TOOLTIP_HTML)
+            return CompactDeck(layers=[build_arc_layer(arc_payload)], tooltip={'html': html}).to_json()
+        spec = run('payload', build_payload, rows=len(arc_data))
+        if 'payload' in results:
+            results['payload']['bytes'] = len(spec.encode('utf-8'))
+
+    if stages & {'predict_single', 'predict_single_sklearn'}:
+        records = to_model_input(pd.read_csv(path, nrows=SINGLE_PREDICTIONS)).to_dict('records')
+        run('predict_single', lambda: [predict_record(scorer, r) for r in records],
+            rows=len(records), calls=len(records))
+        sklearn_records = records[:SINGLE_PREDICTIONS_SKLEARN]
+        if 'predict_single_sklearn' in stages:
+            run('predict_single_sklearn', lambda: [predict_record(pipeline, r) for r in sklearn_records],
+                rows=len(sklearn_records), calls=len(sklearn_records))
+
+    if 'predict_batch' in stages:
+        run('predict_batch', lambda: _with_file(path, lambda f: score_csv(f, scorer))[0])
+    if 'predict_batch_sklearn' in stages:
+        run('predict_batch_sklearn', lambda: _with_file(path, lambda f: score_csv(f, pipeline))[0])
+    return results
+
+
+def compare_results(current, baseline, threshold):
+    # Ortak (boyut, aşama) çiftlerinde süre ya da bellek tepe değeri baseline * threshold'u aşarsa gerilemedir
+    regressions = []
+    for size, stages in current['results'].items():
+        for stage, stats in stages.items():
+            base = baseline['results'].get(size, {}).get(stage)
+            if base is None:
+                continue
+            for metric, floor in (('seconds', MIN_COMPARABLE_SECONDS), ('peak_mb', MIN_COMPARABLE_PEAK_MB)):
+                if metric not in stats or metric not in base or base[metric] < floor:
+                    continue
+                ratio = stats[metric] / base[metric]
+                if ratio > threshold:
+                    regressions.append({
+                        'size': size, 'stage': stage, 'metric': metric,
+                        'baseline': base[metric], 'current': stats[metric], 'ratio': ratio,
+                    })
+    return regressions
+
+
+def environment_info():
+    import sklearn
+
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'scikit_learn': sklearn.__version__,
+        'lod_row_threshold': LOD_ROW_THRESHOLD,
+    }
+
+
+def print_summary(report):
+    for size, stages in report['results'].items():
+        print(f"\n{int(size):,} satır", file=sys.stderr)
+        for stage, stats in stages.items():
+            peak = f"{stats['peak_mb']:9.1f} MB" if 'peak_mb' in stats else ''
+            print(f"  {stage:24s} {stats['seconds'] * 1000:10.1f} ms {peak}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Veri işleme ve tahmin aşamalarının tarayıcısız performans ölçümü.")
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help="virgülle ayrılmış satır sayıları (ör. 10000,100000,1000000,10000000)")
+    parser.add_argument('--stages', default=','.join(STAGES), help="ölçülecek aşamalar")
+    parser.add_argument('--repeat', type=int, default=3, help="süre için en iyi kaç çalıştırmadan alınacağı")
+    parser.add_argument('--no-memory', action='store_true', help="tracemalloc ile bellek tepe değerini ölçme")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'kusgocu_benchmarks'),
+                        help="üretilen sentetik CSV'lerin saklandığı dizin (tekrar kullanılır)")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help="karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument('--threshold', type=float, default=1.25, help="gerileme sayılacak en küçük oran")
+    parser.add_argument('--compare', help="ölçüm yapmadan bu sonuç dosyasını --baseline ile karşılaştır")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            report = json.load(f)
+    else:
+        stages = {s.strip() for s in args.stages.split(',') if s.strip()}
+        unknown = stages - set(STAGES)
+        if unknown:
+            parser.error(f"bilinmeyen aşamalar: {', '.join(sorted(unknown))}")
+
+        pipeline = joblib.load(os.path.join(REPO_ROOT, MODEL_PATH))
+        scorer = compile_pipeline(pipeline) or pipeline
+        os.makedirs(args.data_dir, exist_ok=True)
+
+        report = {'environment': environment_info(), 'repeat': args.repeat, 'results': {}}
+        for n_rows in (int(s) for s in args.sizes.split(',')):
+            path = synthetic_csv(args.data_dir, n_rows, args.seed)
+            report['results'][str(n_rows)] = benchmark_size(
+                path, n_rows, pipeline, scorer, stages, args.repeat, not args.no_memory
+            )
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print_summary(report)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(report, baseline, args.threshold)
+        for r in regressions:
+            print(f"GERİLEME {int(r['size']):,} satır / {r['stage']} / {r['metric']}: "
+                  f"{r['baseline']:.4g} -> {r['current']:.4g} (x{r['ratio']:.2f})", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"\nGerileme yok (eşik x{args.threshold}).", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.request
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from prediction import input_value_maps
+
+# Servisin beklediği alanlar ve göç CSV'sindeki karşılıkları
+FIELDS = {
+    'Weather_Condition': 'Weather_Condition', 'Pressure_hPa': 'Pressure_hPa',
+    'Migration_Start_Month': 'Migration_Start_Month', 'Species': 'Species', 'Region': 'Region',
+    'Migrated_in_Flock': 'Migrated_in_Flock', 'Flight_Distance_km': 'Flight_Distance_km',
+    'Temperature_C': 'Temperature_C', 'Wind_Speed_kmh': 'Wind_Speed_kmph',
+}
+
+
+def _field_value(field, value):
+    # Servis sayısal alanlarda JSON sayısı bekler; CSV'deki metin değerler sayıya çevrilir, boşlar null olur.
+    # Sayıya çevrilemeyen değerler olduğu gibi gönderilir (servis 400 döner ve hata olarak sayılır).
+    if field in input_value_maps:
+        return value
+    if not value.strip():
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def load_sample_records(path, limit=5000):
+    records = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            records.append({field: _field_value(field, row[source]) for field, source in FIELDS.items()})
+            if len(records) >= limit:
+                break
+    return records
+
+
+def post_json(url, payload, timeout=30):
+    request = urllib.request.Request(url, data=json.dumps(payload).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def run_load_test(base_url, records, n_requests, concurrency, records_per_request):
+    latencies = []
+    failures = []
+    lock = threading.Lock()
+    counter = iter(range(n_requests))
+
+    def worker():
+        rng = random.Random()
+        while True:
+            with lock:
+                if next(counter, None) is None:
+                    return
+            payload = rng.sample(records, records_per_request) if records_per_request > 1 else rng.choice(records)
+            start = time.perf_counter()
+            try:
+                post_json(f"{base_url}/predict", payload)
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed * 1000.0)
+            except Exception as e:
+                with lock:
+                    failures.append(str(e))
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies)
+    result = {
+        'requests': n_requests,
+        'concurrency': concurrency,
+        'records_per_request': records_per_request,
+        'failures': len(failures),
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed,
+        'records_per_second': len(latencies) * records_per_request / elapsed,
+    }
+    if len(latencies):
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        result['client_latency_ms'] = {'p50': p50, 'p95': p95, 'p99': p99, 'max': float(latencies.max())}
+    if failures:
+        result['first_failure'] = failures[0]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tahmin servisine yerel yük testi.")
+    parser.add_argument('--url', default='http://127.0.0.1:8765')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--records-per-request', type=int, default=1)
+    parser.add_argument('--csv', default=os.path.join(REPO_ROOT, 'bird_migration_with_origin_destination.csv'),
+                        help="istek gövdeleri için örnek kayıtların alınacağı göç CSV'si")
+    parser.add_argument('--start-server', action='store_true',
+                        help="servisi bu süreç içinde boş bir portta başlatıp ona karşı test et")
+    parser.add_argument('--window-ms', type=float, default=None, help="--start-server ile: mikro parti penceresi")
+    parser.add_argument('--no-compile', action='store_true', help="--start-server ile: sklearn pipeline'ı ile skorla")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url.rstrip('/')
+    if args.start_server:
+        import joblib
+
+        from prediction import MODEL_PATH, compile_pipeline
+        from prediction_service import DEFAULT_BATCH_WINDOW_MS, create_server
+
+        window_ms = DEFAULT_BATCH_WINDOW_MS if args.window_ms is None else args.window_ms
+        pipeline = joblib.load(os.path.join(REPO_ROOT, MODEL_PATH))
+        scorer = pipeline if args.no_compile else (compile_pipeline(pipeline) or pipeline)
+        server = create_server('127.0.0.1', 0, scorer, window_ms=window_ms)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    records = load_sample_records(args.csv)
+    result = run_load_test(base_url, records, args.requests, args.concurrency, args.records_per_request)
+    with urllib.request.urlopen(f"{base_url}/metrics") as response:
+        result['server_metrics'] = json.loads(response.read())
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+    if server is not None:
+        server.shutdown()
+    # Başarısız istek varsa ölçüm geçersizdir; betik hata koduyla çıkar
+    if result['failures']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+import argparse
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dataset_store import DatasetStore
+from filter_index import build_filter_index, column_values, select_positions
+from ingest import read_migration_csv
+from processing import process_frame
+from synthetic_data import write_synthetic_csv
+
+MODES = ['shared', 'naive']
+
+
+def rss_mb():
+    # Linux'ta anlık yerleşik bellek; diğer sistemlerde yalnızca tepe değer okunabilir
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 1024
+
+
+def session_selections(index, session):
+    # Her oturum farklı bir tür/bölge seçimi yapar
+    species = column_values(index, 'Species_TR')
+    regions = column_values(index, 'Region_TR')
+    return {
+        'Species_TR': species[session % len(species):][:2],
+        'Region_TR': regions[session % len(regions):][:1],
+    }
+
+
+def load_frame(path):
+    with open(path, 'rb') as f:
+        df_raw, _ = read_migration_csv(f)
+    return df_raw, process_frame(df_raw)
+
+
+def simulate(mode, paths, n_sessions):
+    # Oturum i, paths[i % len(paths)] dosyasını yükler. "naive" modu paylaşılan depodan önceki davranıştır:
+    # her oturum kendi ham verisini, işlenmiş kopyasını ve filtreleme için bir kopya daha tutar.
+    store = DatasetStore()
+    sessions = []
+    gc.collect()
+    baseline = rss_mb()
+    steps = []
+    for i in range(n_sessions):
+        path = paths[i % len(paths)]
+        if mode == 'shared':
+            handle = store.acquire(path, lambda: (load_frame(path)[1], []))
+            index = handle.derived('filter_index', build_filter_index)
+            sessions.append((handle, select_positions(index, session_selections(index, i))))
+        else:
+            df_raw, df = load_frame(path)
+            index = build_filter_index(df)
+            sessions.append((df_raw, df, df.copy(), select_positions(index, session_selections(index, i))))
+        gc.collect()
+        steps.append(rss_mb() - baseline)
+
+    result = {
+        'mode': mode,
+        'sessions': n_sessions,
+        'files': len(paths),
+        'total_mb': steps[-1],
+        'first_session_mb': steps[0],
+        # İlk dosyalar yüklendikten sonra eklenen her oturumun ortalama maliyeti
+        'per_session_mb': (steps[-1] - steps[len(paths) - 1]) / max(n_sessions - len(paths), 1),
+        'steps_mb': steps,
+    }
+    if mode == 'shared':
+        for handle, _ in sessions:
+            handle.release()
+        result['store'] = dict(store.stats)
+        result['entries_after_release'] = len(store.snapshot())
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="N eşzamanlı oturumun bellek kullanımını paylaşılan depo ile ve depo olmadan ölçer.")
+    parser.add_argument('--sessions', type=int, default=30)
+    parser.add_argument('--files', type=int, default=1, help="oturumların dağıtıldığı farklı dosya sayısı")
+    parser.add_argument('--rows', type=int, default=100_000, help="sentetik dosya başına satır sayısı")
+    parser.add_argument('--csv', help="sentetik veri yerine kullanılacak CSV dosyası (tüm oturumlar aynı dosyayı yükler)")
+    parser.add_argument('--modes', default=','.join(MODES))
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'kusgocu_benchmarks'))
+    parser.add_argument('--output', help="sonuçların yazılacağı JSON dosyası")
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--paths', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        # Alt süreç: tek bir modu temiz bir bellek durumuyla ölçer
+        print(json.dumps(simulate(args.mode, args.paths.split(os.pathsep), args.sessions)))
+        return
+
+    if args.csv:
+        paths = [os.path.abspath(args.csv)]
+    else:
+        os.makedirs(args.data_dir, exist_ok=True)
+        paths = []
+        for seed in range(args.files):
+            path = os.path.join(args.data_dir, f'migration_{args.rows}_{seed}.csv')
+            if not os.path.exists(path):
+                write_synthetic_csv(path, args.rows, seed=seed)
+            paths.append(path)
+
+    results = []
+    for mode in (m.strip() for m in args.modes.split(',') if m.strip()):
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--mode', mode, '--sessions', str(args.sessions),
+             '--paths', os.pathsep.join(paths)],
+            check=True, capture_output=True, text=True,
+        )
+        results.append(json.loads(out.stdout.splitlines()[-1]))
+
+    print(f"{args.sessions} oturum, {len(paths)} dosya", file=sys.stderr)
+    print(f"  {'mod':8s} {'toplam MB':>10s} {'ilk oturum MB':>14s} {'ek oturum MB':>13s}", file=sys.stderr)
+    for r in results:
+        print(f"  {r['mode']:8s} {r['total_mb']:10.1f} {r['first_session_mb']:14.1f} {r['per_session_mb']:13.2f}", file=sys.stderr)
+        if 'entries_after_release' in r:
+            print(f"  paylaşılan depo: {r['store']}, bırakma sonrası kalan veri kümesi: {r['entries_after_release']}", file=sys.stderr)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+import argparse
+import os
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+# bird_migration_with_origin_destination.csv ile aynı sütunlar, kategoriler ve değer aralıkları.
+# Kategorik değerler örnek dosyadaki gibi eşit olasılıkla seçilir.
+CATEGORIES = {
+    'Species': ['Hawk', 'Stork', 'Warbler', 'Goose', 'Eagle', 'Swallow', 'Crane'],
+    'Region': ['South America', 'North America', 'Asia', 'Africa', 'Australia', 'Europe'],
+    'Habitat': ['Wetland', 'Coastal', 'Urban', 'Forest', 'Mountain', 'Grassland'],
+    'Weather_Condition': ['Foggy', 'Stormy', 'Windy', 'Clear', 'Rainy'],
+    'Migration_Reason': ['Feeding', 'Avoid Predators', 'Climate Change', 'Breeding'],
+    'Nesting_Success': ['No', 'Yes'],
+    'Migration_Start_Month': ['Mar', 'Jan', 'Nov', 'Oct', 'Feb', 'May', 'Apr', 'Sep'],
+    'Migration_End_Month': ['Nov', 'Apr', 'Mar', 'Dec', 'Jun', 'Oct', 'May'],
+    'Tag_Type': ['GPS', 'Radio', 'Satellite'],
+    'Migrated_in_Flock': ['Yes', 'No'],
+    'Food_Supply_Level': ['High', 'Low', 'Medium'],
+    'Tracking_Quality': ['Fair', 'Good', 'Poor', 'Excellent'],
+    'Migration_Interrupted': ['Yes', 'No'],
+    'Interrupted_Reason': ['Storm', 'Injury', 'Predator', 'Lost Signal'],
+    'Tagged_By': ['Researcher_B', 'Researcher_A', 'Researcher_C'],
+    'Migration_Success': ['Successful', 'Failed'],
+    'Recovery_Location_Known': ['Yes', 'No'],
+    'Observation_Quality': ['Low', 'High', 'Moderate'],
+}
+
+# (en küçük, en büyük, ondalık basamak); ondalık None ise tam sayı sütunudur
+NUMERIC_RANGES = {
+    'Flight_Distance_km': (500.0, 4500.0, 2),
+    'Flight_Duration_hours': (12.0, 91.0, 1),
+    'Average_Speed_kmph': (30.0, 69.0, 2),
+    'Max_Altitude_m': (1000, 9999, None),
+    'Min_Altitude_m': (100, 899, None),
+    'Temperature_C': (-10.0, 35.0, 1),
+    'Wind_Speed_kmph': (0.0, 60.0, 1),
+    'Humidity_%': (10, 99, None),
+    'Pressure_hPa': (950.0, 1050.0, 1),
+    'Visibility_km': (1.0, 20.0, 1),
+    'Tag_Battery_Level_%': (10, 99, None),
+    'Signal_Strength_dB': (-108.0, -33.0, 1),
+    'Rest_Stops': (1, 14, None),
+    'Predator_Sightings': (0, 9, None),
+    'Flock_Size': (1, 499, None),
+    'Tag_Weight_g': (5.0, 30.0, 2),
+    'Recovery_Time_days': (1, 119, None),
+    'Observation_Counts': (1, 99, None),
+}
+
+COLUMN_ORDER = [
+    'Bird_ID', 'Species', 'Region', 'Habitat', 'Weather_Condition', 'Migration_Reason',
+    'Start_Latitude', 'Start_Longitude', 'End_Latitude', 'End_Longitude',
+    'Flight_Distance_km', 'Flight_Duration_hours', 'Average_Speed_kmph', 'Max_Altitude_m', 'Min_Altitude_m',
+    'Temperature_C', 'Wind_Speed_kmph', 'Humidity_%', 'Pressure_hPa', 'Visibility_km', 'Nesting_Success',
+    'Tag_Battery_Level_%', 'Signal_Strength_dB', 'Migration_Start_Month', 'Migration_End_Month',
+    'Rest_Stops', 'Predator_Sightings', 'Tag_Type', 'Migrated_in_Flock', 'Flock_Size', 'Food_Supply_Level',
+    'Tracking_Quality', 'Migration_Interrupted', 'Interrupted_Reason', 'Tagged_By', 'Tag_Weight_g',
+    'Migration_Success', 'Recovery_Location_Known', 'Recovery_Time_days', 'Observation_Counts',
+    'Observation_Quality', 'Origin', 'Destination',
+]
+
+# Örnek dosyada Interrupted_Reason değerlerinin yaklaşık %20'si boştur
+INTERRUPTED_REASON_MISSING = 0.2
+
+DEFAULT_CHUNK_ROWS = 500_000
+
+
+def generate_chunk(n_rows, first_id=0, seed=0):
+    rng = np.random.default_rng(seed)
+    # Metin sütunları pyarrow ile birleştirilir; pandas'ın satır satır dönüşümünden çok daha hızlıdır
+    ids = pc.cast(pa.array(np.arange(first_id, first_id + n_rows) + 1000), pa.string())
+    columns = {'Bird_ID': pc.binary_join_element_wise('B', ids, '')}
+
+    for col, values in CATEGORIES.items():
+        codes = rng.integers(0, len(values), n_rows)
+        mask = rng.random(n_rows) < INTERRUPTED_REASON_MISSING if col == 'Interrupted_Reason' else None
+        columns[col] = pa.array(values).take(pa.array(codes, mask=mask))
+
+    for prefix in ('Start', 'End'):
+        columns[f'{prefix}_Latitude'] = rng.uniform(-90.0, 90.0, n_rows)
+        columns[f'{prefix}_Longitude'] = rng.uniform(-180.0, 180.0, n_rows)
+
+    for col, (low, high, decimals) in NUMERIC_RANGES.items():
+        if decimals is None:
+            columns[col] = rng.integers(low, high + 1, n_rows)
+        else:
+            columns[col] = np.round(rng.uniform(low, high, n_rows), decimals)
+
+    # Origin/Destination örnek dosyadaki gibi "enlem, boylam" metinleridir
+    for col, prefix in (('Origin', 'Start'), ('Destination', 'End')):
+        latitudes = pc.cast(pa.array(columns[f'{prefix}_Latitude']), pa.string())
+        longitudes = pc.cast(pa.array(columns[f'{prefix}_Longitude']), pa.string())
+        columns[col] = pc.binary_join_element_wise(latitudes, longitudes, ', ')
+
+    return pa.table({col: columns[col] for col in COLUMN_ORDER})
+
+
+def write_synthetic_csv(path, n_rows, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS):
+    # Büyük dosyalar bellekte tutulmadan parça parça yazılır; her parça kendi tohumuyla üretilir
+    tmp_path = f"{path}.tmp"
+    writer = None
+    try:
+        for i, first_id in enumerate(range(0, n_rows, chunk_rows)):
+            chunk = generate_chunk(min(chunk_rows, n_rows - first_id), first_id, seed=(seed, i))
+            if writer is None:
+                writer = pacsv.CSVWriter(tmp_path, chunk.schema)
+            writer.write_table(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_path, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Göç CSV şemasına uygun sentetik veri üretir.")
+    parser.add_argument('rows', type=int)
+    parser.add_argument('output')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    write_synthetic_csv(args.output, args.rows, seed=args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+import hashlib
+import time
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Yinelenen kayıtların ayıklandığı kimlik sütunu
+ID_COLUMN = "Bird_ID"
+
+
+def combine_fingerprints(base_fingerprint, delta_fingerprint):
+    # Ekleme sonrası veri kümesinin kimliği; aynı dosyalar aynı sırayla eklendiğinde oturumlar arasında paylaşılır
+    return hashlib.blake2b(f"{base_fingerprint}+{delta_fingerprint}".encode("ascii"), digest_size=16).hexdigest()
+
+
+def _id_hashes(values):
+    # Kimlikler 64 bit özetleriyle karşılaştırılır; her satır için Python nesnesi üretilmez
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+
+def build_id_index(df):
+    # Boş olmayan kimliklerin sıralı özetleri; kimlik sütunu yoksa None (yinelenen ayıklama yapılmaz)
+    if ID_COLUMN not in df.columns:
+        return None
+    values = df[ID_COLUMN]
+    return np.sort(_id_hashes(values[values.notna()]))
+
+
+def _known_ids(id_index, hashes):
+    positions = np.searchsorted(id_index, hashes)
+    found = positions < len(id_index)
+    found[found] = id_index[positions[found]] == hashes[found]
+    return found
+
+
+def dedupe_delta(id_index, delta_df):
+    # Mevcut kayıtlarda ya da eklenen dosyanın önceki satırlarında bulunan kimlikler atlanır (ilk kayıt korunur).
+    # Kimliği boş olan satırlar ayıklanamadığından her zaman eklenir.
+    if id_index is None or ID_COLUMN not in delta_df.columns:
+        return delta_df, 0
+    values = delta_df[ID_COLUMN]
+    known = values.notna().to_numpy()
+    hashes = _id_hashes(values[known])
+    keep = ~_known_ids(id_index, hashes)
+    _, first = np.unique(hashes, return_index=True)
+    first_seen = np.zeros(len(hashes), dtype=bool)
+    first_seen[first] = True
+    keep &= first_seen
+
+    mask = np.ones(len(delta_df), dtype=bool)
+    mask[known] = keep
+    return delta_df[mask], int((~mask).sum())
+
+
+def extend_id_index(id_index, delta_df):
+    if id_index is None or ID_COLUMN not in delta_df.columns:
+        return id_index
+    values = delta_df[ID_COLUMN]
+    hashes = np.sort(_id_hashes(values[values.notna()]))
+    return np.insert(id_index, np.searchsorted(id_index, hashes), hashes)
+
+
+def _append_column(base, delta):
+    if isinstance(base.dtype, pd.CategoricalDtype):
+        if base.cat.ordered:
+            # Sıralı kategoriler (aylar) sabittir; eklenen değerler aynı kategorilere kodlanır
+            delta = pd.Categorical(delta, categories=base.cat.categories, ordered=True)
+            return union_categoricals([base.array, delta])
+        # Alfabetik sıralı kategoriler (Türkçe etiketler) birleşimde de sıralı kalır
+        delta = delta.array if isinstance(delta.dtype, pd.CategoricalDtype) else pd.Categorical(delta)
+        return union_categoricals([base.array, delta], sort_categories=base.cat.categories.is_monotonic_increasing)
+    return pd.concat([base, delta.astype(base.dtype)], ignore_index=True).array
+
+
+def append_frame(df, delta_df):
+    # İşlenmiş veri kümesine yeni satırlar eklenir; kategorik sütunların kategorileri birleştirilir.
+    # Eklenen satırların indeksi mevcut satırların ardından devam eder.
+    start = int(df.index.max()) + 1 if len(df) else 0
+    index = df.index.append(pd.RangeIndex(start, start + len(delta_df)))
+    columns = {}
+    for col in df.columns:
+        if col in delta_df.columns:
+            delta = delta_df[col]
+        else:
+            delta = pd.Series(pd.NA if df[col].dtype == "str" else np.nan, index=delta_df.index).astype(df[col].dtype)
+        columns[col] = pd.Series(_append_column(df[col], delta), index=index)
+    return pd.DataFrame(columns)
+
+
+def append_dataset(df, derived, delta_df, extenders):
+    # Yalnızca yeni satırlar işlenir: yinelenenler ayıklanır, veri kümesi ve türetilmiş yapılar
+    # (indeksler, özet küpü) yeni satırlarla genişletilir. Mevcut nesneler değiştirilmez; başka
+    # oturumlar eski veri kümesini kullanmaya devam edebilir.
+    # extenders: {türetilmiş yapı adı: fn(eski yapı, eklenen satırlar) -> yeni yapı}; karşılığı olmayan
+    # yapılar yeni veri kümesinde ihtiyaç olduğunda baştan kurulur.
+    start = time.perf_counter()
+    id_index = derived.get("id_index")
+    if id_index is None and "id_index" not in derived:
+        id_index = build_id_index(df)
+    delta_df, duplicates = dedupe_delta(id_index, delta_df)
+
+    combined = append_frame(df, delta_df) if len(delta_df) else df
+    # Genişletme, birleştirilmiş kategorilerle kodlanmış yeni satırlar üzerinden yapılır
+    appended = combined.iloc[len(df):]
+    extended = {"id_index": extend_id_index(id_index, appended)}
+    for name, value in derived.items():
+        if name in extenders:
+            extended[name] = extenders[name](value, appended) if len(appended) else value
+
+    stats = {
+        "rows_added": len(appended),
+        "duplicates_skipped": duplicates,
+        "deduplicated": id_index is not None,
+        "rows_total": len(combined),
+        "seconds": time.perf_counter() - start,
+    }
+    extended["append_log"] = derived.get("append_log", []) + [stats]
+    return combined, extended
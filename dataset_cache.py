@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+
+import ingest
+import processing
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow yoksa disk önbelleği devre dışı kalır
+    pa = None
+
+# İşlenmiş veri kümelerinin diskte (Arrow IPC biçiminde) saklandığı klasör ve toplam boyut sınırı
+CACHE_DIR = Path(os.environ.get("KUSGOCU_CACHE_DIR", ".kusgocu_cache"))
+CACHE_MAX_BYTES = int(os.environ.get("KUSGOCU_CACHE_MAX_MB", "1024")) * 1024 * 1024
+
+# process_frame çıktısının biçimi değiştiğinde elle artırılır
+CACHE_FORMAT_VERSION = 4
+# prediction.CompiledScorer.to_dict çıktısının biçimi değiştiğinde elle artırılır
+MODEL_WEIGHTS_VERSION = 1
+
+
+def _cache_version():
+    # Çeviri tabloları ya da okuma şeması değiştiğinde anahtar da değişir, eski dosyalar kullanılmaz ve zamanla silinir.
+    payload = json.dumps({
+        "format": CACHE_FORMAT_VERSION,
+        "schema": ingest.MIGRATION_SCHEMA,
+        "months": processing.MONTHS_TR,
+        "month_order": processing.MONTH_ORDER_TR,
+        "species": processing.SPECIES_TR,
+        "region": processing.REGION_TR,
+        "reason": processing.REASON_TR,
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+
+CACHE_VERSION = _cache_version()
+
+
+def fingerprint_upload(file_obj, block_size=1 << 20):
+    # Yüklenen dosyanın ham baytlarının özeti; dosya bloklar halinde okunur, kopyası çıkarılmaz.
+    digest = hashlib.blake2b(digest_size=16)
+    file_obj.seek(0)
+    for block in iter(lambda: file_obj.read(block_size), b""):
+        digest.update(block)
+    file_obj.seek(0)
+    return digest.hexdigest()
+
+
+def cache_path(fingerprint):
+    return CACHE_DIR / f"{CACHE_VERSION}-{fingerprint}.arrow"
+
+
+def load_cached(fingerprint):
+    path = cache_path(fingerprint)
+    if pa is None or not path.exists():
+        return None
+    try:
+        # Sıkıştırılmamış Arrow dosyası bellek eşlemeyle açılır; okuma neredeyse kopyasızdır
+        df = feather.read_table(path, memory_map=True).to_pandas()
+    except Exception:
+        # Bozuk ya da yarım kalmış dosya: silip yeniden işlemeye bırakalım
+        path.unlink(missing_ok=True)
+        return None
+    # Son kullanım zamanı LRU tahliyesi için dosya zamanında tutulur
+    os.utime(path)
+    return df
+
+
+def store(fingerprint, df):
+    if pa is None:
+        return
+    path = cache_path(fingerprint)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    # Önbelleğe yazmak isteğe bağlıdır: dönüştürülemeyen sütun, dolu disk ya da yazılamayan klasör
+    # yüklemeyi durdurmaz, veri kümesi yalnızca önbelleğe alınmamış olur
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        feather.write_feather(pa.Table.from_pandas(df), tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+        evict()
+    except (OSError, pa.ArrowException, ValueError, TypeError):
+        return
+    finally:
+        _remove(tmp_path)
+
+
+def model_weights_path(model_fingerprint):
+    return CACHE_DIR / f"model-v{MODEL_WEIGHTS_VERSION}-{model_fingerprint}.json"
+
+
+def load_model_weights(model_fingerprint):
+    # Derlenmiş skorlayıcının ağırlıkları; anahtar model dosyasının özeti olduğundan dosya değişince kullanılmaz
+    path = model_weights_path(model_fingerprint)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        path.unlink(missing_ok=True)
+        return None
+
+
+def store_model_weights(model_fingerprint, weights):
+    path = model_weights_path(model_fingerprint)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    # Yazılamazsa model yine kullanılır; ağırlıklar bir sonraki başlangıçta yeniden derlenir
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(weights, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        return
+    finally:
+        _remove(tmp_path)
+
+
+def _remove(path):
+    # Bellek eşlemesi hâlâ açık olan dosyalar bazı sistemlerde silinemez; bir sonraki turda tekrar denenir
+    try:
+        path.unlink(missing_ok=True)
+        return True
+    except OSError:
+        return False
+
+
+def evict(max_bytes=None):
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    if not CACHE_DIR.exists():
+        return
+
+    entries = []
+    for path in CACHE_DIR.glob("*.arrow"):
+        # Eski sürüm anahtarlı dosyalar artık hiç okunmayacağı için doğrudan silinir
+        if not path.name.startswith(f"{CACHE_VERSION}-"):
+            _remove(path)
+            continue
+        stat = path.stat()
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    # En uzun süredir kullanılmayan dosyalardan başlayarak sınırın altına inene kadar sil
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if _remove(path):
+            total -= size
@@ -0,0 +1,121 @@
+import threading
+import weakref
+
+
+class _Entry:
+    def __init__(self):
+        self.ready = threading.Event()
+        self.value = None
+        self.error = None
+        self.refcount = 0
+        self.derived = {}
+        self.derived_lock = threading.Lock()
+
+
+class DatasetHandle:
+    # Bir oturumun paylaşılan veri kümesine tuttuğu referans. release() çağrıldığında ya da handle
+    # çöpe gittiğinde (ör. oturum kapanıp session_state silindiğinde) referans sayısı bir azalır.
+    def __init__(self, store, fingerprint, entry, loaded):
+        self.fingerprint = fingerprint
+        self.loaded = loaded
+        self._entry = entry
+        self._finalizer = weakref.finalize(self, store._release, fingerprint, entry)
+
+    @property
+    def df(self):
+        return self._entry.value[0]
+
+    @property
+    def issues(self):
+        return self._entry.value[1]
+
+    @property
+    def released(self):
+        return not self._finalizer.alive
+
+    def derived(self, name, build):
+        # Veri kümesinden türetilen yapılar (ör. filtre indeksi) bir kez kurulur, tüm oturumlarca
+        # paylaşılır ve veri kümesiyle birlikte atılır
+        entry = self._entry
+        with entry.derived_lock:
+            if name not in entry.derived:
+                entry.derived[name] = build(self.df)
+            return entry.derived[name]
+
+    def built_derived(self):
+        # Şu ana kadar kurulmuş türetilmiş yapılar (ör. yeni satırlar eklenirken genişletilmek üzere)
+        with self._entry.derived_lock:
+            return dict(self._entry.derived)
+
+    def release(self):
+        self._finalizer()
+
+
+class DatasetStore:
+    # İşlenmiş veri kümelerinin süreç genelindeki deposu. Aynı dosyayı yükleyen oturumlar tek bir
+    # salt okunur DataFrame'i paylaşır (pandas Copy-on-Write sayesinde filtreler paylaşılan veriyi
+    # değiştirmez). Hiçbir oturumun kullanmadığı veri kümesi hemen bellekten atılır; tekrar
+    # gerektiğinde diskteki Arrow önbelleğinden hızla okunur.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.stats = {"loads": 0, "shared": 0, "evictions": 0}
+
+    def acquire(self, fingerprint, loader):
+        # loader() -> (df, issues) ya da (df, issues, türetilmiş yapılar). Aynı anda aynı dosyayı isteyen
+        # oturumlardan yalnızca biri yükler, diğerleri onun bitmesini bekler.
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            owner = entry is None
+            if owner:
+                entry = self._entries[fingerprint] = _Entry()
+                self.stats["loads"] += 1
+            else:
+                self.stats["shared"] += 1
+            entry.refcount += 1
+
+        if owner:
+            try:
+                value = loader()
+                if len(value) == 3:
+                    # Veri kümesiyle birlikte hazırlanan yapılar (ör. genişletilmiş indeksler) yeniden kurulmaz
+                    entry.derived.update(value[2])
+                entry.value = value[:2]
+            except BaseException as e:
+                # Streamlit yeniden çalıştırmayı BaseException ile kestiği için yarım kalan yükleme de temizlenir
+                entry.error = e
+                with self._lock:
+                    if self._entries.get(fingerprint) is entry:
+                        del self._entries[fingerprint]
+                entry.ready.set()
+                raise
+            entry.ready.set()
+        else:
+            entry.ready.wait()
+            if entry.error is not None:
+                # Yükleyen oturum başarısız oldu; bu oturum kendisi yeniden dener
+                return self.acquire(fingerprint, loader)
+        return DatasetHandle(self, fingerprint, entry, loaded=owner)
+
+    def _release(self, fingerprint, entry):
+        with self._lock:
+            entry.refcount -= 1
+            if entry.refcount <= 0 and self._entries.get(fingerprint) is entry:
+                del self._entries[fingerprint]
+                self.stats["evictions"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            entries = [(fp, e) for fp, e in self._entries.items() if e.ready.is_set() and e.value is not None]
+            refcounts = {fp: e.refcount for fp, e in entries}
+        rows = []
+        for fp, entry in entries:
+            df = entry.value[0]
+            rows.append({
+                "fingerprint": fp[:12],
+                "sessions": refcounts[fp],
+                "rows": len(df),
+                "memory_mb": df.memory_usage(deep=True).sum() / 2 ** 20,
+                "derived": ", ".join(entry.derived),
+            })
+        return rows
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+# Kenar çubuğundaki filtrelerin uygulandığı sütunlar
+FILTER_COLUMNS = ["Species_TR", "Region_TR", "Migration_Start_Month_TR"]
+
+
+def _value_bitmaps(values, offset=0):
+    # Her değer için satır konumlarının bit eşlemi; konumlar offset kadar kaydırılır (ilk offset bit boştur)
+    n_bits = offset + len(values)
+    codes, uniques = pd.factorize(values, sort=True)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+
+    bitmaps = {}
+    for i, value in enumerate(uniques):
+        positions = order[bounds[i]:bounds[i + 1]]
+        bits = np.zeros(n_bits, dtype=bool)
+        bits[positions + offset] = True
+        bitmaps[value] = {"count": len(positions), "bitmap": np.packbits(bits)}
+    return bitmaps
+
+
+def build_filter_index(df, columns=FILTER_COLUMNS):
+    # Her sütun değeri için satır konumlarını sıkıştırılmış bit eşlem (packbits) olarak tutar.
+    # Veri kümesi başına bir kez kurulur; filtreler bit işlemleri ve tek bir take ile uygulanır.
+    index = {"n_rows": len(df), "columns": {}}
+    for col in columns:
+        if col not in df.columns:
+            continue
+        index["columns"][col] = _value_bitmaps(df[col])
+    return index
+
+
+def extend_filter_index(index, delta_df):
+    # Eklenen satırlar (delta_df, mevcut satırların ardından gelir) için yeni bir indeks döner; eski indeks
+    # değişmez, çünkü başka oturumlar onu kullanıyor olabilir. Yalnızca yeni satırlar taranır; mevcut
+    # bit eşlemler bayt düzeyinde kopyalanıp yeni bitlerle birleştirilir.
+    n_old = index["n_rows"]
+    n_rows = n_old + len(delta_df)
+    n_bytes = (n_rows + 7) // 8
+    # Yeni satırların ilk biti, mevcut son baytın (n_old // 8) içine düşer
+    first_byte, shift = divmod(n_old, 8)
+    extended = {"n_rows": n_rows, "columns": {}}
+    for col, entries in index["columns"].items():
+        delta_bitmaps = _value_bitmaps(delta_df[col], offset=shift) if col in delta_df.columns else {}
+        values = {}
+        for value in _merged_order(entries, delta_bitmaps, delta_df[col] if col in delta_df.columns else None):
+            bitmap = np.zeros(n_bytes, dtype=np.uint8)
+            count = 0
+            if value in entries:
+                old = entries[value]["bitmap"]
+                bitmap[:len(old)] = old
+                count += entries[value]["count"]
+            if value in delta_bitmaps:
+                new = delta_bitmaps[value]["bitmap"]
+                np.bitwise_or(bitmap[first_byte:first_byte + len(new)], new, out=bitmap[first_byte:first_byte + len(new)])
+                count += delta_bitmaps[value]["count"]
+            values[value] = {"count": count, "bitmap": bitmap}
+        extended["columns"][col] = values
+    return extended
+
+
+def _merged_order(entries, delta_bitmaps, delta_values):
+    # Değerler build_filter_index ile aynı sırada tutulur: kategorik sütunda kategori sırası, diğerlerinde sıralı
+    merged = set(entries) | set(delta_bitmaps)
+    if delta_values is not None and isinstance(delta_values.dtype, pd.CategoricalDtype):
+        return [value for value in delta_values.cat.categories if value in merged]
+    return sorted(merged)
+
+
+def column_values(index, col):
+    # Sütunun sıralı benzersiz değerleri (kategorik sütunlarda kategori sırası korunur)
+    return list(index["columns"].get(col, {}))
+
+
+def value_counts(index, col):
+    return {value: entry["count"] for value, entry in index["columns"].get(col, {}).items()}
+
+
+def select_positions(index, selections):
+    # selections: {sütun: seçilen değerler}. Boş seçimler filtre uygulamaz.
+    # Bir sütundaki değerlerin bit eşlemleri OR, sütunlar arası AND ile birleştirilir.
+    combined = None
+    for col, selected in selections.items():
+        if not selected:
+            continue
+        entries = index["columns"].get(col, {})
+        col_bits = np.zeros((index["n_rows"] + 7) // 8, dtype=np.uint8)
+        for value in selected:
+            entry = entries.get(value)
+            if entry is not None:
+                np.bitwise_or(col_bits, entry["bitmap"], out=col_bits)
+        combined = col_bits if combined is None else np.bitwise_and(combined, col_bits, out=combined)
+
+    if combined is None:
+        return None
+    return np.flatnonzero(np.unpackbits(combined, count=index["n_rows"]))
+
+
+def apply_filters(df, index, selections, positions=None):
+    # Filtre yoksa veri kopyalanmadan döner; aksi halde yalnızca seçilen satırlar alınır.
+    # positions verilirse (ör. konum sorgusu sonucu, sıralı) seçim bu satırlarla da kesiştirilir.
+    selected = select_positions(index, selections)
+    if positions is not None:
+        selected = positions if selected is None else np.intersect1d(selected, positions, assume_unique=True)
+    if selected is None:
+        return df
+    return df.take(selected)
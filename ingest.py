@@ -0,0 +1,197 @@
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+from pandas.api.types import union_categoricals
+
+from processing import POSITION_COLUMNS
+
+# Göç CSV'sinden harita, filtreler ve tooltip için okunan sütunlar ve tipleri.
+# Diğer sütunlar hiç ayrıştırılmaz.
+MIGRATION_SCHEMA = {
+    # Kayıt kimliği; yeni kayıtlar eklenirken yinelenenler bununla ayıklanır (bkz. dataset_append.py)
+    "Bird_ID": "str",
+    "Species": "category",
+    "Region": "category",
+    "Migration_Reason": "category",
+    "Migration_Start_Month": "category",
+    # Koordinatlar float64 kalır: tooltip'teki iki ondalıklı etiketler kaynak değerlerden üretilir ve
+    # float32'de x.xx5 gibi değerler ters yöne yuvarlanabilir
+    "Start_Latitude": "float64",
+    "Start_Longitude": "float64",
+    "End_Latitude": "float64",
+    "End_Longitude": "float64",
+    "Flight_Distance_km": "float64",
+    # Özet küpü için göç sonucu ve kesinti durumu (bkz. aggregate_cube.py)
+    "Migration_Success": "category",
+    "Migration_Interrupted": "category",
+}
+
+# Sayıya çevrilmeden okunan tipler
+TEXT_DTYPES = ("category", "str")
+
+DEFAULT_CHUNKSIZE = 250_000
+# Ayrıştırıcının tek seferde okuduğu blok; parçalar (chunksize satır) bu bloklardan toplanır
+READ_BLOCK_BYTES = 8 << 20
+# Her parça için raporlanan en fazla atlanmış satır örneği
+MAX_REPORTED_LINES = 5
+
+
+def _stream_size(source):
+    position = source.tell()
+    source.seek(0, os.SEEK_END)
+    size = source.tell()
+    source.seek(position)
+    return size
+
+
+def _read_header(source):
+    # Sütun adları yalnızca ilk satırdan okunur; dosyada bulunmayan şema sütunları ayrıştırıcıya istenmez
+    line = source.readline()
+    source.seek(0)
+    if not line.strip():
+        raise pd.errors.EmptyDataError("No columns to parse from file")
+    return next(csv.reader([line.decode("utf-8-sig") if isinstance(line, bytes) else line]))
+
+
+def _column_type(dtype):
+    # Kategorik sütunlar sözlük kodlu okunur; sayısal sütunlar hatalı değerler satır bazında
+    # sayılabilsin diye önce metin olarak okunur (bkz. _cast_numeric)
+    return pa.dictionary(pa.int32(), pa.string()) if dtype == "category" else pa.string()
+
+
+def _cast_numeric(table, schema):
+    # Hatasız bloklarda metin sütunlar doğrudan sayıya çevrilir; çevrilemeyen sütunlar pandas'ta
+    # değer değer dönüştürülür ve hatalı değerler sayılır (bkz. _coerce_chunk)
+    for i, name in enumerate(table.column_names):
+        if schema.get(name) in TEXT_DTYPES:
+            continue
+        try:
+            table = table.set_column(i, name, pc.cast(table.column(i), pa.float64()))
+        except pa.ArrowInvalid:
+            pass
+    return table
+
+
+def _coerce_chunk(chunk, schema):
+    # Sayısal sütunlar ayrıştırıldıktan sonra dönüştürülür; sayıya çevrilemeyen değerler NaN olur ve sayılır.
+    # Konum sütunlarından biri boş olan satırlar da geçersiz sayılır (haritada gösterilemezler).
+    invalid = pd.Series(False, index=chunk.index)
+    coerced_values = {}
+    missing_values = {}
+    for col, dtype in schema.items():
+        if col not in chunk.columns or dtype == "str":
+            continue
+        if dtype == "category":
+            # Kategoriler görülme sırasıyla gelir; filtre seçenekleri ve kodlar için sıralanır
+            chunk[col] = chunk[col].cat.reorder_categories(chunk[col].cat.categories.sort_values())
+            continue
+        values = pd.to_numeric(chunk[col], errors="coerce")
+        bad = values.isna() & chunk[col].notna()
+        if bad.any():
+            coerced_values[col] = int(bad.sum())
+            invalid |= bad
+        if col in POSITION_COLUMNS:
+            missing = chunk[col].isna()
+            if missing.any():
+                missing_values[col] = int(missing.sum())
+                invalid |= missing
+        chunk[col] = values.astype(dtype)
+    return chunk, coerced_values, missing_values, int(invalid.sum())
+
+
+def _concat_chunks(chunks, schema):
+    if not chunks:
+        return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in schema.items()})
+    # Parçaların kategorileri farklı olabileceğinden kategorik sütunlar ayrıca birleştirilir
+    columns = {}
+    for col in chunks[0].columns:
+        parts = [chunk[col] for chunk in chunks]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            columns[col] = pd.Series(union_categoricals([p.array for p in parts]))
+        elif schema.get(col) == "str":
+            columns[col] = pd.concat(parts, ignore_index=True)
+        else:
+            columns[col] = pd.Series(np.concatenate([p.to_numpy() for p in parts]))
+    return pd.DataFrame(columns)
+
+
+def read_migration_csv(source, schema=MIGRATION_SCHEMA, chunksize=DEFAULT_CHUNKSIZE, progress=None):
+    # CSV akış halinde okunur; yalnızca şemadaki sütunlar alınır ve ilk andan itibaren kompakt tiplerde
+    # tutulur. Hatalı satırlar her parça için ayrı raporlanır:
+    # - alan sayısı başlıktan farklı satırlar (eksik/fazla alan, kapatılmamış tırnak) atlanır ve okuma sürer,
+    # - sayıya çevrilemeyen değerler ve boş konum alanları geçersiz satır olarak sayılır.
+    # Tırnak içindeki alanlar satır sonu içeremez; kapatılmamış bir tırnak dosyanın geri kalanını yutmaz.
+    source.seek(0)
+    total_bytes = _stream_size(source) or 1
+    columns = [col for col in _read_header(source) if col in schema]
+
+    skipped_lines = []
+    def skip_line(row):
+        skipped_lines.append(row)
+        return "skip"
+
+    try:
+        reader = pacsv.open_csv(
+            source,
+            read_options=pacsv.ReadOptions(block_size=READ_BLOCK_BYTES),
+            parse_options=pacsv.ParseOptions(newlines_in_values=False, invalid_row_handler=skip_line),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=columns,
+                column_types={col: _column_type(schema[col]) for col in columns},
+                strings_can_be_null=True,
+            ),
+        )
+    except pa.ArrowInvalid as e:
+        # İlk blok okunamıyorsa dosyanın hiçbir kısmı kullanılamaz
+        raise pd.errors.ParserError(str(e).strip()) from e
+
+    chunks = []
+    issues = []
+    rows_read = 0
+    batches = []
+    batch_rows = 0
+
+    def finish_chunk():
+        nonlocal rows_read, batch_rows
+        table = _cast_numeric(pa.Table.from_batches(batches, schema=reader.schema), schema)
+        chunk, coerced_values, missing_values, invalid_rows = _coerce_chunk(table.to_pandas(), schema)
+        if invalid_rows or skipped_lines:
+            issue = {"chunk": len(chunks) + 1, "first_row": rows_read + 1, "invalid_rows": invalid_rows,
+                     "columns": coerced_values, "missing": missing_values, "skipped_lines": len(skipped_lines)}
+            if skipped_lines:
+                issue["lines"] = [
+                    {"line": row.number, "expected": row.expected_columns, "actual": row.actual_columns, "text": row.text[:80]}
+                    for row in skipped_lines[:MAX_REPORTED_LINES]
+                ]
+            issues.append(issue)
+        skipped_lines.clear()
+        chunks.append(chunk)
+        rows_read += len(chunk)
+        batches.clear()
+        batch_rows = 0
+
+    error = None
+    try:
+        for batch in reader:
+            batches.append(batch)
+            batch_rows += batch.num_rows
+            if batch_rows >= chunksize:
+                finish_chunk()
+                if progress is not None:
+                    progress(min(source.tell() / total_bytes, 1.0), rows_read)
+    except pa.ArrowInvalid as e:
+        # Ayrıştırıcı bu noktadan sonra devam edemez (ör. geçersiz UTF-8); o ana kadar okunan satırlar korunur
+        error = str(e).strip()
+    if batches or skipped_lines:
+        finish_chunk()
+    if error is not None:
+        issues.append({"chunk": len(chunks) + 1, "first_row": rows_read + 1, "error": error})
+    if progress is not None:
+        progress(1.0, rows_read)
+
+    return _concat_chunks(chunks, schema), issues
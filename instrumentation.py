@@ -0,0 +1,221 @@
+import argparse
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Süreç genelinde (tüm oturumlar) saklanan son yeniden çalıştırma sayısı
+TRACE_HISTORY = int(os.environ.get("KUSGOCU_TRACE_HISTORY", "200"))
+# Ayarlanırsa her yeniden çalıştırmanın izi bu dosyaya bir JSON satırı olarak eklenir
+TRACE_FILE = os.environ.get("KUSGOCU_TRACE_FILE")
+
+_local = threading.local()
+_lock = threading.Lock()
+_history = deque(maxlen=TRACE_HISTORY)
+_counters = {}
+_rerun_ids = itertools.count(1)
+
+
+class RerunTrace:
+    # Bir oturumun tek bir yeniden çalıştırmasında açılan zaman aralıkları (span) ve sayaçlar.
+    # Streamlit her oturumun betiğini kendi iş parçacığında çalıştırdığından iz iş parçacığına bağlıdır.
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.rerun_id = next(_rerun_ids)
+        self.started_at = time.time()
+        self.duration_ms = None
+        self.spans = []
+        self.counters = {}
+        self.depth = 0
+        self._start = time.perf_counter()
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self._start) * 1000.0
+
+    def to_dict(self):
+        return {
+            "session_id": self.session_id,
+            "rerun_id": self.rerun_id,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "spans": self.spans,
+            "counters": self.counters,
+        }
+
+
+def json_default(value):
+    # Span özniteliklerindeki NumPy sayıları JSON'a yazılabilsin diye Python tiplerine çevrilir
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def begin_rerun(session_id):
+    # Önceki çalıştırma st.stop() ya da hata ile yarıda kaldıysa izi kaydedilmeden atılır
+    _local.trace = RerunTrace(session_id)
+    _local.pending_lookups = {}
+    return _local.trace
+
+
+def current_trace():
+    return getattr(_local, "trace", None)
+
+
+def end_rerun():
+    trace = current_trace()
+    if trace is None:
+        return None
+    _local.trace = None
+    trace.duration_ms = trace.elapsed_ms()
+    record = trace.to_dict()
+    with _lock:
+        _history.append(record)
+        if TRACE_FILE:
+            with open(TRACE_FILE, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=json_default) + "\n")
+    return record
+
+
+@contextmanager
+def span(name, **attrs):
+    # Etkin bir iz yoksa hiçbir şey kaydedilmez. Dönen sözlüğe blok içinde öznitelik eklenebilir.
+    trace = current_trace()
+    if trace is None:
+        yield attrs
+        return
+    record = {"name": name, "start_ms": trace.elapsed_ms(), "duration_ms": None, "depth": trace.depth, "attrs": attrs}
+    trace.spans.append(record)
+    trace.depth += 1
+    try:
+        yield attrs
+    finally:
+        trace.depth -= 1
+        record["duration_ms"] = trace.elapsed_ms() - record["start_ms"]
+
+
+def mark(name, **attrs):
+    # Süresiz bir olay (ör. ilk çizim anı)
+    with span(name, **attrs) as span_attrs:
+        return span_attrs
+
+
+def count(name, n=1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+    trace = current_trace()
+    if trace is not None:
+        trace.counters[name] = trace.counters.get(name, 0) + n
+
+
+@contextmanager
+def cache_lookup(name, **attrs):
+    # st.cache_* ile sarılmış bir fonksiyon çağrısını ölçer. Fonksiyon gövdesi yalnızca önbellek
+    # ıskalandığında çalışır ve cache_miss() çağırır; çağrılmazsa çağrı isabet olarak sayılır.
+    pending = getattr(_local, "pending_lookups", None)
+    if pending is None:
+        pending = _local.pending_lookups = {}
+    pending[name] = False
+    with span(name, **attrs) as span_attrs:
+        try:
+            yield span_attrs
+        finally:
+            missed = pending.pop(name, False)
+            span_attrs["cache"] = "miss" if missed else "hit"
+            count(f"{name}.{'miss' if missed else 'hit'}")
+
+
+def cache_miss(name):
+    pending = getattr(_local, "pending_lookups", None)
+    if pending is not None and name in pending:
+        pending[name] = True
+    else:
+        # cache_lookup dışında (ör. arka plan iş parçacığında) yapılan çağrılar doğrudan sayılır
+        count(f"{name}.miss")
+
+
+def counters():
+    with _lock:
+        return dict(sorted(_counters.items()))
+
+
+def recent_reruns(session_id=None, limit=None):
+    with _lock:
+        reruns = [r for r in _history if session_id is None or r["session_id"] == session_id]
+    return reruns[-limit:] if limit else reruns
+
+
+def summarize(reruns):
+    # Span adı başına süre dağılımı; yeniden çalıştırmanın tamamı "rerun" adıyla eklenir.
+    # numpy yalnızca burada gerekir; uygulamanın ilk çizimini geciktirmemek için geç içe aktarılır.
+    import numpy as np
+
+    durations = {"rerun": [r["duration_ms"] for r in reruns]}
+    for rerun in reruns:
+        for s in rerun["spans"]:
+            if s["duration_ms"] is not None:
+                durations.setdefault(s["name"], []).append(s["duration_ms"])
+
+    summary = []
+    for name, values in durations.items():
+        if not values:
+            continue
+        values = np.asarray(values)
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        summary.append({
+            "span": name, "count": len(values), "p50_ms": p50, "p95_ms": p95, "p99_ms": p99,
+            "max_ms": float(values.max()), "total_ms": float(values.sum()),
+        })
+    return summary
+
+
+def to_chrome_trace(reruns):
+    # chrome://tracing ve Perfetto'nun okuduğu "Trace Event" biçimi; her oturum ayrı bir satırda (tid) gösterilir
+    sessions = {}
+    events = []
+    for rerun in reruns:
+        tid = sessions.setdefault(rerun["session_id"], len(sessions) + 1)
+        base_us = rerun["started_at"] * 1e6
+        events.append({
+            "name": "rerun", "ph": "X", "pid": 1, "tid": tid, "ts": base_us,
+            "dur": rerun["duration_ms"] * 1000.0, "args": {"rerun_id": rerun["rerun_id"], **rerun["counters"]},
+        })
+        for s in rerun["spans"]:
+            if s["duration_ms"] is None:
+                continue
+            events.append({
+                "name": s["name"], "ph": "X", "pid": 1, "tid": tid, "ts": base_us + s["start_ms"] * 1000.0,
+                "dur": s["duration_ms"] * 1000.0, "args": s["attrs"],
+            })
+    for session_id, tid in sessions.items():
+        events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": f"oturum {session_id}"}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KUSGOCU_TRACE_FILE ile kaydedilen izlerin özeti ve Chrome trace dönüşümü.")
+    parser.add_argument("trace_file", help="JSONL iz dosyası")
+    parser.add_argument("--chrome", help="chrome://tracing / Perfetto için yazılacak JSON dosyası")
+    args = parser.parse_args()
+
+    reruns = read_jsonl(args.trace_file)
+    sessions = {r["session_id"] for r in reruns}
+    print(f"{len(reruns)} yeniden çalıştırma, {len(sessions)} oturum")
+    print(f"{'span':32s} {'adet':>7s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'max ms':>9s}")
+    for row in sorted(summarize(reruns), key=lambda r: -r["total_ms"]):
+        print(f"{row['span']:32s} {row['count']:7d} {row['p50_ms']:9.1f} {row['p95_ms']:9.1f} {row['p99_ms']:9.1f} {row['max_ms']:9.1f}")
+
+    if args.chrome:
+        with open(args.chrome, "w", encoding="utf-8") as f:
+            json.dump(to_chrome_trace(reruns), f, default=json_default)
+
+
+if __name__ == "__main__":
+    main()
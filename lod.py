@@ -0,0 +1,88 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Bu satır sayısının üzerindeki sonuçlar haritada toplulaştırılmış yaylar olarak çizilir
+LOD_ROW_THRESHOLD = int(os.environ.get("KUSGOCU_LOD_THRESHOLD", "50000"))
+
+# Bir web haritası karosunun (256 px) kenarına düşen ızgara hücresi sayısı
+CELLS_PER_TILE = 4
+
+
+def grid_cell_degrees(zoom):
+    # Yakınlaştırma arttıkça hücreler küçülür; her seviyede ekranda yaklaşık aynı hücre yoğunluğu korunur
+    return 360.0 / (2.0 ** zoom) / CELLS_PER_TILE
+
+
+def _dominant(group_ids, values, n_groups):
+    # Her grupta en sık görülen değer: (grup, değer) çiftleri tek bir bincount ile sayılır
+    codes, uniques = pd.factorize(values)
+    valid = codes >= 0
+    n_values = max(len(uniques), 1)
+    counts = np.bincount(
+        group_ids[valid] * n_values + codes[valid], minlength=n_groups * n_values
+    ).reshape(n_groups, n_values)
+    distinct = (counts > 0).sum(axis=1)
+    if len(uniques) == 0:
+        return np.full(n_groups, "", dtype=object), distinct
+    return np.asarray(uniques, dtype=object)[counts.argmax(axis=1)], distinct
+
+
+def _group_arcs(start_lat, start_lon, end_lat, end_lon, cell):
+    # Dört hücre koordinatı tek bir int64 anahtara paketlenir ve factorize ile gruplanır
+    n_lat = int(np.ceil(180.0 / cell)) + 2
+    n_lon = int(np.ceil(360.0 / cell)) + 2
+    sy = np.clip(np.floor((start_lat + 90.0) / cell), 0, n_lat - 1).astype(np.int64)
+    sx = np.clip(np.floor((start_lon + 180.0) / cell), 0, n_lon - 1).astype(np.int64)
+    ey = np.clip(np.floor((end_lat + 90.0) / cell), 0, n_lat - 1).astype(np.int64)
+    ex = np.clip(np.floor((end_lon + 180.0) / cell), 0, n_lon - 1).astype(np.int64)
+    key = ((sy * n_lon + sx) * n_lat + ey) * n_lon + ex
+    group_ids, uniques = pd.factorize(key)
+    return group_ids, len(uniques)
+
+
+def aggregate_arcs(df, zoom, max_arcs=None):
+    # Başlangıç ve bitiş noktaları ızgara hücrelerine yerleştirilir; aynı hücre çiftini
+    # paylaşan yaylar tek bir yayda birleştirilir. Yay sayısı max_arcs'ı aşarsa
+    # hücreler büyütülerek sonuç boyutu sınırlanır.
+    max_arcs = LOD_ROW_THRESHOLD if max_arcs is None else max_arcs
+    cell = grid_cell_degrees(zoom)
+    start_lat = df["Start_Latitude"].to_numpy(dtype=np.float64)
+    start_lon = df["Start_Longitude"].to_numpy(dtype=np.float64)
+    end_lat = df["End_Latitude"].to_numpy(dtype=np.float64)
+    end_lon = df["End_Longitude"].to_numpy(dtype=np.float64)
+    distance = df["Flight_Distance_km"].to_numpy(dtype=np.float64)
+
+    group_ids, n_groups = _group_arcs(start_lat, start_lon, end_lat, end_lon, cell)
+    while n_groups > max_arcs and cell < 180.0:
+        cell *= 2.0
+        group_ids, n_groups = _group_arcs(start_lat, start_lon, end_lat, end_lon, cell)
+
+    count = np.bincount(group_ids, minlength=n_groups)
+    valid_distance = ~np.isnan(distance)
+    distance_count = np.bincount(group_ids[valid_distance], minlength=n_groups)
+    distance_sum = np.bincount(group_ids[valid_distance], weights=distance[valid_distance], minlength=n_groups)
+    mean_distance = np.divide(distance_sum, distance_count, out=np.full(n_groups, np.nan), where=distance_count > 0)
+
+    # Birleşen yaylar hücre merkezinde değil, gerçek uç noktalarının ortalamasında çizilir
+    def group_mean(values):
+        return np.bincount(group_ids, weights=values, minlength=n_groups) / count
+
+    species, species_distinct = _dominant(group_ids, df["Species_TR"].to_numpy(), n_groups)
+    reason, _ = _dominant(group_ids, df["Migration_Reason_TR"].to_numpy(), n_groups)
+
+    aggregated = pd.DataFrame({
+        "Start_Latitude": group_mean(start_lat),
+        "Start_Longitude": group_mean(start_lon),
+        "End_Latitude": group_mean(end_lat),
+        "End_Longitude": group_mean(end_lon),
+        "Arc_Count": count,
+        "Flight_Distance_km": np.round(mean_distance, 1),
+        # Genişlik yay sayısıyla logaritmik olarak artar; tek yay ham moddaki genişliği korur
+        "Arc_Width": np.nan_to_num(mean_distance) * (1.0 + np.log2(count)),
+        "Species_TR": species,
+        "Species_Count": species_distinct,
+        "Migration_Reason_TR": reason,
+    })
+    return aggregated
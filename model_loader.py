@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+import time
+
+# train_model.py --publish ile yayınlanan modelin göstergesi; yoksa uygulamayla gelen model kullanılır
+ACTIVE_MODEL_FILE = os.path.join("models", "active_model.json")
+
+# Isınma tahmini için kenar çubuğundaki varsayılan girdilerin model karşılıkları
+WARMUP_RECORD = {
+    'Weather_Condition': 'Sunny', 'Pressure_hPa': 1010.0, 'Migration_Start_Month': 'Apr',
+    'Species': 'Stork', 'Region': 'Europe', 'Migrated_in_Flock': 'Yes',
+    'Flight_Distance_km': 2500.0, 'Temperature_C': 15.0, 'Wind_Speed_kmh': 20.0,
+}
+
+
+def model_metadata_path(path):
+    # Eğitim ölçümlerinin ve parametrelerinin tutulduğu, model dosyasının yanındaki JSON
+    return os.path.splitext(path)[0] + ".json"
+
+
+def active_model():
+    # Yayınlanmış modelin yolu ve değişiklik zamanı; model yayınlanmamışsa ya da dosyası okunamıyorsa
+    # (None, None). Her yeniden çalıştırmada çağrılır; yalnızca küçük gösterge dosyası okunur.
+    try:
+        with open(ACTIVE_MODEL_FILE, encoding="utf-8") as f:
+            path = os.path.join(os.path.dirname(ACTIVE_MODEL_FILE), json.load(f)["path"])
+        return path, os.stat(path).st_mtime_ns
+    except (OSError, ValueError, KeyError, TypeError):
+        return None, None
+
+
+class ModelLoader:
+    # Pipeline bir arka plan iş parçacığında yüklenir, NumPy skorlayıcıya derlenir ve örnek bir
+    # tahminle ısıtılır. joblib/sklearn ve prediction modülü de bu iş parçacığında içe aktarılır;
+    # böylece sayfa, model hazır olmasını beklemeden çizilebilir. Derlenmiş ağırlıklar model
+    # dosyasının özetiyle diskte saklanır; sonraki soğuk başlangıçlarda sklearn hiç yüklenmez.
+    def __init__(self, path=None):
+        self.path = path
+        self.metadata = None
+        # Model dosyasının içerik özeti; model değişince geçersiz olması gereken sonuçların anahtarıdır
+        self.fingerprint = None
+        self.pipeline = None
+        self.scorer = None
+        self.source = None
+        self.error = None
+        self.timings = {}
+        # Yüklemenin bittiği an (time.monotonic); başarısız yüklemenin yeniden denenmesi buna göre geciktirilir
+        self.finished_at = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="model-warmup", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def wait(self, timeout=None):
+        return self._ready.wait(timeout)
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            import dataset_cache
+            from prediction import MODEL_PATH, CompiledScorer, compile_pipeline, predict_record
+
+            path = self.path = self.path or MODEL_PATH
+            try:
+                with open(model_metadata_path(path), encoding="utf-8") as f:
+                    metadata = json.load(f)
+                self.metadata = metadata if isinstance(metadata, dict) else None
+            except (OSError, ValueError):
+                pass
+            with open(path, "rb") as f:
+                model_fingerprint = self.fingerprint = dataset_cache.fingerprint_upload(f)
+            weights = dataset_cache.load_model_weights(model_fingerprint)
+            if weights is not None:
+                scorer = CompiledScorer.from_dict(weights)
+                self.source = "compiled_cache"
+                loaded = compiled = time.perf_counter()
+            else:
+                import joblib
+
+                self.pipeline = joblib.load(path)
+                loaded = time.perf_counter()
+                scorer = compile_pipeline(self.pipeline)
+                if scorer is not None:
+                    dataset_cache.store_model_weights(model_fingerprint, scorer.to_dict())
+                    self.source = "compiled"
+                else:
+                    scorer = self.pipeline
+                    self.source = "sklearn"
+                compiled = time.perf_counter()
+            predict_record(scorer, WARMUP_RECORD)
+            self.scorer = scorer
+            self.timings = {
+                "load_ms": (loaded - start) * 1000.0,
+                "compile_ms": (compiled - loaded) * 1000.0,
+                "warmup_ms": (time.perf_counter() - compiled) * 1000.0,
+            }
+        except Exception as e:
+            self.error = e
+        finally:
+            self.timings["ready_ms"] = (time.perf_counter() - start) * 1000.0
+            self.finished_at = time.monotonic()
+            self._ready.set()
@@ -0,0 +1,92 @@
+import json
+import re
+import time
+
+import numpy as np
+import pandas as pd
+import pydeck as pdk
+from pydeck.bindings.json_tools import default_serialize
+
+from processing import COORD_LABEL_COLUMNS, format_coord_labels
+
+# Yay katmanının konum alanları ve tarayıcıya gönderilen kısa adları
+POSITION_FIELDS = {
+    "Start_Longitude": "sx",
+    "Start_Latitude": "sy",
+    "End_Longitude": "ex",
+    "End_Latitude": "ey",
+}
+WIDTH_FIELD = "w"
+
+# Koordinatlar tarayıcıya 4 ondalık basamakla (~11 m) gönderilir; float32 hassasiyetinin altında kalmaz
+POSITION_DECIMALS = 4
+
+_TOOLTIP_FIELD = re.compile(r"\{(\w+)\}")
+
+
+def build_arc_payload(df, width_column, tooltip_html):
+    # Yalnızca katmanın ve tooltip'in kullandığı sütunlar alınır. Konum ve genişlik float32 tutulur;
+    # koordinat etiketleri yalnızca gönderilen satırlar için burada üretilir.
+    columns = {key: df[col].to_numpy(dtype=np.float32) for col, key in POSITION_FIELDS.items()}
+    columns[WIDTH_FIELD] = df[width_column].to_numpy(dtype=np.float32)
+
+    # Tooltip alanlarına kısa adlar verilir ve şablon bu adlara göre yeniden yazılır
+    short_names = {}
+    for field in dict.fromkeys(_TOOLTIP_FIELD.findall(tooltip_html)):
+        key = f"t{len(short_names)}"
+        if field in COORD_LABEL_COLUMNS and field not in df.columns:
+            lat_col, lon_col = COORD_LABEL_COLUMNS[field]
+            columns[key] = format_coord_labels(df[lat_col], df[lon_col]).to_numpy()
+        else:
+            columns[key] = df[field].to_numpy()
+        short_names[field] = key
+
+    payload = pd.DataFrame(columns)
+    html = _TOOLTIP_FIELD.sub(lambda m: "{" + short_names.get(m.group(1), m.group(1)) + "}", tooltip_html)
+    return payload, html
+
+
+def payload_records(payload):
+    # float32 değerler JSON'da uzun ondalık açılımlar üretmesin diye yuvarlanmış float64 olarak yazılır
+    values = {}
+    for col in payload.columns:
+        column = payload[col]
+        if column.dtype == np.float32:
+            decimals = POSITION_DECIMALS if col in POSITION_FIELDS.values() else 1
+            values[col] = np.round(column.to_numpy(dtype=np.float64), decimals).tolist()
+        else:
+            values[col] = column.astype(object).where(column.notna(), None).tolist()
+    keys = list(values)
+    return [dict(zip(keys, row)) for row in zip(*values.values())]
+
+
+def build_arc_layer(payload, **layer_kwargs):
+    return pdk.Layer(
+        "ArcLayer",
+        data=payload_records(payload),
+        get_source_position=["sx", "sy"],
+        get_target_position=["ex", "ey"],
+        get_width=WIDTH_FIELD,
+        **layer_kwargs
+    )
+
+
+def _serialize(o):
+    attrs = default_serialize(o)
+    if isinstance(attrs, dict):
+        attrs.pop("payloadStats", None)
+    return attrs
+
+
+class CompactDeck(pdk.Deck):
+    # Streamlit haritayı to_json() ile serileştirir; pydeck'in girintili (indent=2) çıktısı yerine
+    # boşluksuz JSON üretilir. Boyut ve süre payload_stats içinde tutulur.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.payload_stats = None
+
+    def to_json(self):
+        start = time.perf_counter()
+        spec = json.dumps(self, sort_keys=True, default=_serialize, separators=(",", ":"))
+        self.payload_stats = {"bytes": len(spec.encode("utf-8")), "seconds": time.perf_counter() - start}
+        return spec
@@ -0,0 +1,336 @@
+import io
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+MODEL_PATH = 'logistic_model_9_features_5k_samples.pkl'
+
+# MODELİN BEKLEDİĞİ 9 SÜTUNUN SIRASI
+input_data_columns = [
+    'Weather_Condition', 'Pressure_hPa', 'Migration_Start_Month',
+    'Species', 'Region', 'Migrated_in_Flock', 'Flight_Distance_km',
+    'Temperature_C', 'Wind_Speed_kmh'
+]
+
+# Girdi değerlerini modelin anlayacağı İngilizce formatına dönüştürme
+weather_condition_map = {'Güneşli': 'Sunny', 'Bulutlu': 'Cloudy', 'Yağmurlu': 'Rainy', 'Rüzgarlı': 'Windy', 'Sisli': 'Foggy'}
+species_map = {
+    'Leylek': 'Stork', 'Kaz': 'Goose', 'Turna': 'Crane', 'Şahin': 'Hawk',
+    'Kızılgerdan': 'Robin', 'Serçe': 'Sparrow', 'Kartal': 'Eagle', 'Baykuş': 'Owl',
+    'Pelikan': 'Pelican', 'Ördek': 'Duck'
+}
+region_map = {
+    "Kuzey Amerika": "North America", "Güney Amerika": "South America", "Avrupa": "Europe",
+    "Asya": "Asia", "Afrika": "Africa", "Okyanusya": "Oceania", "Arktik": "Arctic",
+    "Antarktika": "Antarctic", "Otlak": "Grassland", "Orman": "Forest", "Kentsel": "Urban",
+    "Kıyı": "Coastal", "Sulak Alan": "Wetland", "Dağlık Bölge": "Mountain", "Çöl": "Desert",
+    "Tundra": "Tundra", "Tropikal": "Tropical", "Ilıman": "Temperate", "Kutup": "Polar",
+    "Kıtasal": "Continental", "Ada": "Island", "Denizel": "Marine", "Nehir Kıyısı": "Riverine",
+    "Savana": "Savanna", "Steppe": "Steppe", "Tayga": "Taiga", "Subtropikal": "Subtropical",
+    "Akdeniz": "Mediterranean", "Boreal": "Boreal", "Alpine": "Alpine",
+    "Diğer": "Other", "Bilinmeyen": "Unknown"
+}
+months_map = {
+    "Ocak": "Jan", "Şubat": "Feb", "Mart": "Mar", "Nisan": "Apr", "Mayıs": "May", "Haziran": "Jun",
+    "Temmuz": "Jul", "Ağustos": "Aug", "Eylül": "Sep", "Ekim": "Oct", "Kasım": "Nov", "Aralık": "Dec"
+}
+flock_map = {'Evet': 'Yes', 'Hayır': 'No'}
+
+input_value_maps = {
+    'Weather_Condition': weather_condition_map,
+    'Migration_Start_Month': months_map,
+    'Species': species_map,
+    'Region': region_map,
+    'Migrated_in_Flock': flock_map,
+}
+
+# Göç CSV'sindeki sütun adlarının model girdisindeki karşılıkları
+input_column_aliases = {'Wind_Speed_kmph': 'Wind_Speed_kmh'}
+
+# Toplu tahmin için CSV'den okunan sütunlar; Bird_ID varsa sonuçlarla birlikte yazılır
+SCORING_SCHEMA = {
+    'Bird_ID': 'str',
+    'Weather_Condition': 'category',
+    'Pressure_hPa': 'float64',
+    'Migration_Start_Month': 'category',
+    'Species': 'category',
+    'Region': 'category',
+    'Migrated_in_Flock': 'category',
+    'Flight_Distance_km': 'float64',
+    'Temperature_C': 'float64',
+    'Wind_Speed_kmh': 'float64',
+    'Wind_Speed_kmph': 'float64',
+}
+SCORING_CHUNKSIZE = 50_000
+PROBABILITY_COLUMN = 'Success_Probability'
+
+
+def translate_to_model(values, mapping):
+    # Türkçe değerler İngilizceye çevrilir, diğerleri olduğu gibi kalır (dict.get(x, x) ile aynı).
+    # Her benzersiz değer bir kez çevrilir.
+    codes, uniques = pd.factorize(values)
+    lookup = np.array([mapping.get(u, u) for u in uniques] + [None], dtype=object)
+    return pd.Series(lookup[codes], index=values.index, dtype=object)
+
+
+def to_model_input(df):
+    df = df.rename(columns={alias: col for alias, col in input_column_aliases.items() if col not in df.columns})
+    missing = [col for col in input_data_columns if col not in df.columns]
+    if missing:
+        raise ValueError(f"Tahmin için gerekli sütunlar bulunamadı: {', '.join(missing)}")
+
+    # Sütunlar önce sözlükte toplanıp DataFrame tek seferde kurulur (küçük partilerde ek yükü azaltır)
+    columns = {}
+    for col in input_data_columns:
+        if col in input_value_maps:
+            columns[col] = translate_to_model(df[col], input_value_maps[col])
+        else:
+            columns[col] = pd.to_numeric(df[col], errors='coerce').astype(np.float64)
+    return pd.DataFrame(columns, index=df.index)
+
+
+class CompiledScorer:
+    # Eğitilmiş pipeline'daki ölçekleyici, one-hot kategorileri ve lojistik katsayılar bir kez okunur.
+    # Skor = sabit + sayısal girdiler · ağırlıklar + her kategorik değerin ağırlığı; sklearn'ün
+    # DataFrame doğrulaması ve one-hot matrisi oluşturması atlanır. predict_proba, sklearn ile aynı
+    # arayüze sahiptir; bu yüzden score_frame ve score_csv ile doğrudan kullanılabilir.
+    def __init__(self, pipeline):
+        preprocessor = pipeline.steps[0][1]
+        classifier = pipeline.steps[-1][1]
+        if len(pipeline.steps) != 2 or classifier.coef_.shape[0] != 1:
+            raise ValueError("Yalnızca ön işleyici + ikili lojistik regresyon pipeline'ı derlenebilir.")
+
+        coef = classifier.coef_[0]
+        self.classes = classifier.classes_
+        self.intercept = float(classifier.intercept_[0])
+        self.numeric_columns = []
+        numeric_weights = []
+        self.category_weights = {}
+
+        offset = 0
+        for name, transformer, columns in preprocessor.transformers_:
+            if transformer == 'drop':
+                continue
+            kind = type(transformer).__name__
+            if kind == 'StandardScaler':
+                weights = coef[offset:offset + len(columns)]
+                mean = transformer.mean_ if transformer.mean_ is not None else np.zeros(len(columns))
+                scale = transformer.scale_ if transformer.scale_ is not None else np.ones(len(columns))
+                # (x - ortalama) / ölçek terimleri ağırlıklara ve sabite katlanır
+                numeric_weights.extend(weights / scale)
+                self.intercept -= float(np.sum(weights * mean / scale))
+                self.numeric_columns.extend(columns)
+                offset += len(columns)
+            elif kind == 'OneHotEncoder' and transformer.drop_idx_ is None and transformer.handle_unknown == 'ignore':
+                for col, categories in zip(columns, transformer.categories_):
+                    # Bilinmeyen kategoriler one-hot'ta sıfır satır üretir, yani katkıları sıfırdır
+                    self.category_weights[col] = dict(zip(categories.tolist(), coef[offset:offset + len(categories)].tolist()))
+                    offset += len(categories)
+            else:
+                raise ValueError(f"Desteklenmeyen dönüştürücü: {name} ({kind})")
+        if offset != len(coef):
+            raise ValueError("Pipeline çıktısı katsayı sayısıyla eşleşmiyor.")
+        self.numeric_weights = np.asarray(numeric_weights, dtype=np.float64)
+
+    def to_dict(self):
+        return {
+            "classes": self.classes.tolist(),
+            "intercept": self.intercept,
+            "numeric_columns": list(self.numeric_columns),
+            "numeric_weights": self.numeric_weights.tolist(),
+            "category_weights": self.category_weights,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        # Diskte saklanan ağırlıklardan sklearn'ü içe aktarmadan skorlayıcı oluşturur
+        scorer = cls.__new__(cls)
+        scorer.classes = np.asarray(data["classes"])
+        scorer.intercept = float(data["intercept"])
+        scorer.numeric_columns = list(data["numeric_columns"])
+        scorer.numeric_weights = np.asarray(data["numeric_weights"], dtype=np.float64)
+        scorer.category_weights = {col: dict(weights) for col, weights in data["category_weights"].items()}
+        return scorer
+
+    def decision_function(self, model_input):
+        z = np.full(len(model_input), self.intercept)
+        z += model_input[self.numeric_columns].to_numpy(dtype=np.float64) @ self.numeric_weights
+        for col, weights in self.category_weights.items():
+            categories = list(weights)
+            codes = pd.Categorical(model_input[col], categories=categories).codes
+            lookup = np.append(np.fromiter(weights.values(), dtype=np.float64, count=len(weights)), 0.0)
+            z += lookup[codes]
+        return z
+
+    def predict_proba(self, model_input):
+        p = 1.0 / (1.0 + np.exp(-self.decision_function(model_input)))
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, model_input):
+        return self.classes[(self.decision_function(model_input) > 0).astype(int)]
+
+    def score_record(self, record):
+        # Tek kayıt için pandas/numpy kullanılmadan etiket ve başarı olasılığı birlikte döner
+        z = self.intercept
+        for col, weight in zip(self.numeric_columns, self.numeric_weights.tolist()):
+            z += weight * float(record[col])
+        for col, weights in self.category_weights.items():
+            z += weights.get(record[col], 0.0)
+        probability = 1.0 / (1.0 + math.exp(-z))
+        return self.classes[int(z > 0)], probability
+
+
+def compile_pipeline(pipeline, check_rows=None):
+    # Derlenmiş skorlayıcı, pipeline ile aynı sonucu verdiği doğrulanırsa döner; aksi halde None
+    try:
+        scorer = CompiledScorer(pipeline)
+    except (AttributeError, ValueError):
+        return None
+
+    if check_rows is None:
+        check_rows = _probe_rows(scorer)
+    expected = pipeline.predict_proba(check_rows)[:, 1]
+    if not np.allclose(scorer.predict_proba(check_rows)[:, 1], expected, rtol=0, atol=1e-9):
+        return None
+    return scorer
+
+
+def _probe_rows(scorer, n_rows=256, seed=0):
+    # Doğrulama için her kategoriyi (ve bilinmeyen bir değeri) içeren rastgele girdiler
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for col in input_data_columns:
+        if col in scorer.category_weights:
+            values = list(scorer.category_weights[col]) + ['__bilinmeyen__']
+            columns[col] = np.array(values, dtype=object)[rng.integers(0, len(values), n_rows)]
+        else:
+            columns[col] = rng.normal(0, 1000, n_rows)
+    return pd.DataFrame(columns)
+
+
+def predict_record(scorer, record):
+    # Tek kaydın etiketi ve başarı olasılığı; derlenmemiş pipeline için sklearn yoluna düşülür
+    if isinstance(scorer, CompiledScorer):
+        return scorer.score_record(record)
+    frame = pd.DataFrame([record], columns=input_data_columns)
+    return scorer.predict(frame)[0], float(scorer.predict_proba(frame)[0, 1])
+
+
+def sensitivity_grid(scorer, record, axes):
+    # axes: {sütun: değerler}. Eksenlerin tüm kombinasyonları, diğer girdiler record'daki değerlerinde
+    # sabit tutularak tek bir predict_proba çağrısında skorlanır.
+    names = list(axes)
+    mesh = np.meshgrid(*[np.asarray(values, dtype=np.float64) for values in axes.values()], indexing='ij')
+    n_points = mesh[0].size
+    columns = {}
+    for col in input_data_columns:
+        if col in axes:
+            columns[col] = mesh[names.index(col)].ravel()
+        else:
+            value = record[col]
+            columns[col] = np.full(n_points, value, dtype=object if isinstance(value, str) else np.float64)
+
+    grid = pd.DataFrame(columns)
+    grid[PROBABILITY_COLUMN] = scorer.predict_proba(grid)[:, 1]
+    return grid[names + [PROBABILITY_COLUMN]]
+
+
+def score_frame(pipeline, model_input):
+    # Eksik girdili satırlar skorlanmaz, olasılıkları NaN kalır
+    probabilities = np.full(len(model_input), np.nan)
+    complete = model_input.notna().all(axis=1).to_numpy()
+    if complete.any():
+        probabilities[complete] = pipeline.predict_proba(model_input[complete])[:, 1]
+    return probabilities
+
+
+def score_csv(source, pipeline, output_format='csv', chunksize=SCORING_CHUNKSIZE, progress=None, appended=()):
+    # CSV parça parça okunur, her parça tek bir predict_proba çağrısıyla skorlanır ve
+    # sonuç aynı anda CSV ya da Parquet olarak yazılır; bellekte tüm dosya tutulmaz.
+    # appended: veri kümesine sırayla eklenmiş dosyalar; kayıtları yüklenen dosyanın ardından skorlanır ve
+    # veri kümesine eklenirken olduğu gibi daha önce görülmüş kimlikler atlanır (bkz. dataset_append.dedupe_delta)
+    from dataset_append import ID_COLUMN, build_id_index, dedupe_delta, extend_id_index
+
+    sources = [source, *appended]
+    sizes = []
+    for current in sources:
+        sizes.append(current.seek(0, io.SEEK_END))
+        current.seek(0)
+    total_bytes = sum(sizes) or 1
+
+    output = io.BytesIO()
+    parquet_writer = None
+    with_ids = None
+    id_index = None
+    rows_scored = 0
+    rows_skipped = 0
+    rows_duplicate = 0
+    scoring_seconds = 0.0
+    start = time.perf_counter()
+    for i, current in enumerate(sources):
+        reader = pd.read_csv(
+            current,
+            usecols=lambda col: col in SCORING_SCHEMA,
+            dtype={col: dtype for col, dtype in SCORING_SCHEMA.items() if dtype != 'float64'},
+            chunksize=chunksize,
+        )
+        with reader:
+            for chunk in reader:
+                if appended:
+                    # Kimlik özetleri yalnızca eklenmiş dosya varsa tutulur
+                    if i == 0:
+                        id_index = build_id_index(chunk) if id_index is None else extend_id_index(id_index, chunk)
+                    elif id_index is not None:
+                        chunk, duplicates = dedupe_delta(id_index, chunk)
+                        rows_duplicate += duplicates
+                        id_index = extend_id_index(id_index, chunk)
+
+                model_input = to_model_input(chunk)
+                scoring_start = time.perf_counter()
+                probabilities = score_frame(pipeline, model_input)
+                scoring_seconds += time.perf_counter() - scoring_start
+
+                result = model_input
+                # Çıktı sütunları ilk parçaya göre belirlenir; kimliği olmayan dosyaların satırlarında kimlik boş kalır
+                if with_ids is None:
+                    with_ids = ID_COLUMN in chunk.columns
+                if with_ids:
+                    ids = chunk[ID_COLUMN] if ID_COLUMN in chunk.columns else pd.Series(None, index=chunk.index, dtype='str')
+                    result.insert(0, ID_COLUMN, ids)
+                result[PROBABILITY_COLUMN] = probabilities
+
+                if output_format == 'parquet':
+                    import pyarrow as pa
+                    import pyarrow.parquet as pq
+
+                    # Sonraki parçalar ilk parçanın şemasıyla yazılır (tamamen boş bir sütun tip değiştirmesin)
+                    schema = parquet_writer.schema if parquet_writer is not None else None
+                    table = pa.Table.from_pandas(result, schema=schema, preserve_index=False)
+                    if parquet_writer is None:
+                        parquet_writer = pq.ParquetWriter(output, table.schema)
+                    parquet_writer.write_table(table)
+                else:
+                    result.to_csv(output, header=rows_scored + rows_skipped == 0, index=False)
+
+                skipped = int(np.isnan(probabilities).sum())
+                rows_skipped += skipped
+                rows_scored += len(result) - skipped
+                if progress is not None:
+                    progress(min((sum(sizes[:i]) + current.tell()) / total_bytes, 1.0), rows_scored + rows_skipped)
+
+    if parquet_writer is not None:
+        parquet_writer.close()
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        'rows_scored': rows_scored,
+        'rows_skipped': rows_skipped,
+        'rows_duplicate': rows_duplicate,
+        'files': len(sources),
+        'seconds': elapsed,
+        'rows_per_second': (rows_scored + rows_skipped) / elapsed if elapsed > 0 else 0.0,
+        'scoring_rows_per_second': rows_scored / scoring_seconds if scoring_seconds > 0 else 0.0,
+    }
+    return output.getvalue(), stats
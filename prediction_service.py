@@ -0,0 +1,288 @@
+import argparse
+import json
+import math
+import queue
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from model_loader import active_model
+from prediction import MODEL_PATH, compile_pipeline, input_data_columns, input_value_maps, score_frame, to_model_input
+
+# Aynı pencere içinde gelen istekler tek bir predict_proba çağrısında skorlanır
+DEFAULT_BATCH_WINDOW_MS = 5.0
+DEFAULT_MAX_BATCH_SIZE = 512
+REQUEST_TIMEOUT_SECONDS = 30.0
+
+# Gecikme histogramının üst sınırları (ms)
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000]
+
+
+class ServiceMetrics:
+    # Son isteklerin gecikmeleri halka tamponda tutulur; yüzdelikler ve histogram buradan hesaplanır
+    def __init__(self, window=10_000):
+        self._lock = threading.Lock()
+        self._latencies_ms = deque(maxlen=window)
+        self._batch_sizes = deque(maxlen=window)
+        self._started = time.time()
+        self.requests = 0
+        self.records = 0
+        self.batches = 0
+        self.errors = 0
+
+    def record_request(self, latency_seconds, n_records):
+        with self._lock:
+            self._latencies_ms.append(latency_seconds * 1000.0)
+            self.requests += 1
+            self.records += n_records
+
+    def record_batch(self, n_records):
+        with self._lock:
+            self._batch_sizes.append(n_records)
+            self.batches += 1
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self):
+        with self._lock:
+            latencies = np.array(self._latencies_ms)
+            batch_sizes = np.array(self._batch_sizes)
+            uptime = time.time() - self._started
+            snapshot = {
+                "uptime_seconds": uptime,
+                "requests": self.requests,
+                "records": self.records,
+                "batches": self.batches,
+                "errors": self.errors,
+                "requests_per_second": self.requests / uptime if uptime > 0 else 0.0,
+                "records_per_second": self.records / uptime if uptime > 0 else 0.0,
+            }
+        if len(latencies):
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            counts = np.histogram(latencies, bins=[0] + LATENCY_BUCKETS_MS + [np.inf])[0]
+            snapshot["latency_ms"] = {
+                "p50": p50, "p95": p95, "p99": p99, "max": float(latencies.max()),
+                "histogram": {f"<={bound}" if bound != np.inf else "inf": int(count)
+                              for bound, count in zip(LATENCY_BUCKETS_MS + [np.inf], counts)},
+            }
+        if len(batch_sizes):
+            snapshot["batch_size"] = {"mean": float(batch_sizes.mean()), "max": int(batch_sizes.max())}
+        return snapshot
+
+
+class _PendingRequest:
+    def __init__(self, records):
+        self.records = records
+        self.results = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class MicroBatcher:
+    # İstek iş parçacıkları kayıtlarını kuyruğa bırakıp bekler; tek bir işçi iş parçacığı
+    # pencere dolana ya da en büyük parti boyutuna ulaşılana kadar istekleri toplayıp birlikte skorlar.
+    def __init__(self, pipeline, metrics, window_ms=DEFAULT_BATCH_WINDOW_MS, max_batch_size=DEFAULT_MAX_BATCH_SIZE):
+        self.pipeline = pipeline
+        self.metrics = metrics
+        self.window_seconds = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, records):
+        pending = _PendingRequest(records)
+        self._queue.put(pending)
+        if not pending.done.wait(REQUEST_TIMEOUT_SECONDS):
+            raise TimeoutError("Tahmin zaman aşımına uğradı.")
+        if pending.error is not None:
+            raise pending.error
+        return pending.results
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0].records)
+            deadline = time.perf_counter() + self.window_seconds
+            while size < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    pending = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(pending)
+                size += len(pending.records)
+            self._score(batch)
+
+    def _score(self, batch):
+        try:
+            records = [record for pending in batch for record in pending.records]
+            model_input = to_model_input(pd.DataFrame.from_records(records, columns=input_data_columns))
+            probabilities = score_frame(self.pipeline, model_input)
+            # Etiket, uygulamadaki predict_record gibi modelin kendi predict'i (classes_) ile belirlenir
+            complete = ~np.isnan(probabilities)
+            labels = np.full(len(records), None, dtype=object)
+            if complete.any():
+                labels[complete] = [label.item() if hasattr(label, "item") else label
+                                    for label in self.pipeline.predict(model_input[complete])]
+            self.metrics.record_batch(len(records))
+
+            offset = 0
+            for pending in batch:
+                end = offset + len(pending.records)
+                pending.results = [
+                    {"prediction": label, "success_probability": float(p)} if not np.isnan(p)
+                    else {"error": "Eksik ya da geçersiz girdi değeri."}
+                    for p, label in zip(probabilities[offset:end], labels[offset:end])
+                ]
+                offset = end
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0].error = e
+            else:
+                # Hatalı bir istek partideki diğerlerini düşürmesin: istekler tek tek skorlanır,
+                # hata yalnızca ona neden olan isteğe döner
+                for pending in batch:
+                    self._score([pending])
+        finally:
+            for pending in batch:
+                pending.done.set()
+
+
+def _valid_value(col, value):
+    # Kategorik alanlar metin, sayısal alanlar sonlu sayı olmalıdır (1e400 gibi değerler inf olarak okunur);
+    # null eksik değer sayılır ve o kayıt skorlanmaz
+    if value is None:
+        return True
+    if col in input_value_maps:
+        return isinstance(value, str)
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return False
+    try:
+        return math.isfinite(value)
+    except OverflowError:
+        # float'a sığmayan tam sayılar
+        return False
+
+
+def _validate_records(payload):
+    # Tek bir kayıt (nesne) ya da kayıt listesi kabul edilir; alanlar input_data_columns ile aynıdır
+    records = payload if isinstance(payload, list) else [payload]
+    if not records:
+        raise ValueError("En az bir kayıt gönderilmelidir.")
+    for i, record in enumerate(records):
+        if not isinstance(record, dict):
+            raise ValueError(f"{i}. kayıt bir JSON nesnesi olmalıdır.")
+        missing = [col for col in input_data_columns if col not in record]
+        if missing:
+            raise ValueError(f"{i}. kayıtta eksik alanlar: {', '.join(missing)}")
+        invalid = [col for col in input_data_columns if not _valid_value(col, record[col])]
+        if invalid:
+            raise ValueError(f"{i}. kayıtta geçersiz türde alanlar: {', '.join(invalid)}")
+    return records
+
+
+class PredictionRequestHandler(BaseHTTPRequestHandler):
+    batcher = None
+    metrics = None
+
+    def _send_json(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/metrics":
+            self._send_json(200, self.metrics.snapshot())
+        else:
+            self._send_json(404, {"error": "Bulunamadı."})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send_json(404, {"error": "Bulunamadı."})
+            return
+
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"null")
+            records = _validate_records(payload)
+        except (ValueError, json.JSONDecodeError) as e:
+            self.metrics.record_error()
+            self._send_json(400, {"error": str(e)})
+            return
+
+        try:
+            results = self.batcher.submit(records)
+        except Exception as e:
+            self.metrics.record_error()
+            self._send_json(500, {"error": f"Tahmin yapılırken bir hata oluştu: {e}"})
+            return
+
+        self.metrics.record_request(time.perf_counter() - start, len(records))
+        self._send_json(200, results if isinstance(payload, list) else results[0])
+
+    def log_message(self, format, *args):
+        # Her istek için erişim günlüğü yazılmaz; ölçümler /metrics üzerinden izlenir
+        pass
+
+
+class _PredictionServer(ThreadingHTTPServer):
+    # Eşzamanlı bağlantı patlamalarında bağlantıların reddedilmemesi için dinleme kuyruğu büyütülür
+    request_queue_size = 256
+
+
+def create_server(host, port, pipeline, window_ms=DEFAULT_BATCH_WINDOW_MS, max_batch_size=DEFAULT_MAX_BATCH_SIZE):
+    metrics = ServiceMetrics()
+    handler = type("BoundPredictionRequestHandler", (PredictionRequestHandler,), {
+        "batcher": MicroBatcher(pipeline, metrics, window_ms, max_batch_size),
+        "metrics": metrics,
+    })
+    server = _PredictionServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Göç başarısı tahmin modeli için yerel HTTP servisi.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--model", default=active_model()[0] or MODEL_PATH,
+                        help="joblib ile kaydedilmiş 9 özellikli pipeline (varsayılan: train_model.py ile yayınlanan model)")
+    parser.add_argument("--window-ms", type=float, default=DEFAULT_BATCH_WINDOW_MS, help="mikro parti toplama penceresi")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH_SIZE, help="bir partideki en fazla kayıt")
+
+    parser.add_argument("--no-compile", action="store_true", help="derlenmiş NumPy skorlayıcı yerine sklearn pipeline'ını kullan")
+    args = parser.parse_args()
+
+    pipeline = joblib.load(args.model)
+    scorer = None if args.no_compile else compile_pipeline(pipeline)
+    if scorer is None:
+        scorer = pipeline
+        print("Model sklearn pipeline'ı ile skorlanıyor.")
+    server = create_server(args.host, args.port, scorer, args.window_ms, args.max_batch)
+    print(f"Tahmin servisi http://{args.host}:{args.port} adresinde çalışıyor (POST /predict, GET /metrics, GET /health)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
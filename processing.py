@@ -0,0 +1,171 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Harita için gerekli koordinat ve mesafe sütunları
+REQUIRED_COORDS = ["Start_Latitude", "Start_Longitude", "End_Latitude", "End_Longitude", "Flight_Distance_km"]
+POSITION_COLUMNS = ["Start_Latitude", "Start_Longitude", "End_Latitude", "End_Longitude"]
+
+# Tooltip ve tablo için koordinat etiketleri; tüm veri için saklanmaz, yalnızca gösterilen satırlar için üretilir
+COORD_LABEL_COLUMNS = {
+    "Start_Coords_TR": ("Start_Latitude", "Start_Longitude"),
+    "End_Coords_TR": ("End_Latitude", "End_Longitude"),
+}
+
+# Harita filtrelemesi ve tooltip için Türkçe çeviriler
+MONTHS_TR = {
+    "Jan": "Ocak", "Feb": "Şubat", "Mar": "Mart", "Apr": "Nisan", "May": "Mayıs", "Jun": "Haziran",
+    "Jul": "Temmuz", "Aug": "Ağustos", "Sep": "Eylül", "Oct": "Ekim", "Nov": "Kasım", "Dec": "Aralık"
+}
+MONTH_ORDER_TR = ["Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran",
+                  "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"]
+
+SPECIES_TR = {
+    "Stork": "Leylek", "Warder": "Balıkçı", "Crane": "Turna", "Hawk": "Şahin",
+    "Goose": "Kaz", "Eagle": "Kartal", "Owl": "Baykuş", "Robin": "Kızılgerdan",
+    "Sparrow": "Serçe", "Seagull": "Martı", "Pelican": "Pelikan", "Duck": "Ördek",
+    "Pigeon": "Güvercin", "Crow": "Karga", "Penguin": "Penguen", "Ostrich": "Devekuşu",
+    "Kiwi": "Kivi", "Parrot": "Papağan", "Flamingo": "Flamingo", "Swan": "Kuğu",
+    "Falcon": "Atmaca", "Vulture": "Akbaba", "Hummingbird": "Sinekkuşu",
+    "Woodpecker": "Ağaçkakan", "Kingfisher": "Yalıçapkını", "Osprey": "Balık Kartalı",
+    "Albatross": "Albatros", "Condor": "Kondor", "Macaw": "Ara", "Canary": "Kanarya",
+    "Quail": "Bıldırcın", "Raven": "Kuzgun", "Rooster": "Horoz", "Sandpiper": "Kumkuşu",
+    "Skylark": "Tarlakuşu", "Starling": "Sığırcık", "Swallow": "Kırlangıç", "Toucan": "Tukan",
+    "Turkey": "Hindi", "Wren": "Çitkuşu", "Puffin": "Deniz Papağanı", "Cormorant": "Karabatak",
+    "Heron": "Balıkçıl", "Ibis": "İbis", "Plover": "Kıyı Kuşu", "Teal": "Çamurcun",
+    "Wagtail": "Kuyruksallayan", "Woodcock": "Çulluk", "Pipit": "İncirkuşu",
+    "Other": "Diğer", "Unknown": "Bilinmeyen"
+}
+
+REGION_TR = {
+    "North America": "Kuzey Amerika", "South America": "Güney Amerika", "Europe": "Avrupa",
+    "Asia": "Asya", "Africa": "Afrika", "Oceania": "Okyanusya", "Arctic": "Arktik",
+    "Antarctic": "Antarktika", "Grassland": "Otlak", "Forest": "Orman", "Urban": "Kentsel",
+    "Coastal": "Kıyı", "Wetland": "Sulak Alan", "Mountain": "Dağlık Bölge", "Desert": "Çöl",
+    "Tundra": "Tundra", "Tropikal": "Tropikal", "Temperate": "Ilıman", "Polar": "Kutup",
+    "Continental": "Kıtasal", "Ada": "Ada", "Denizel": "Denizel", "Riverine": "Nehir Kıyısı",
+    "Savanna": "Savana", "Steppe": "Step", "Taiga": "Tayga", "Subtropical": "Subtropikal",
+    "Mediterranean": "Akdeniz", "Boreal": "Boreal", "Alpine": "Alpin",
+    "Other": "Diğer", "Unknown": "Bilinmeyen"
+}
+
+REASON_TR = {
+    "Feeding": "Beslenme", "Breeding": "Üreme", "Climate": "İklim Koşulları",
+    "Shelter": "Barınma", "Predator Avoidance": "Avcıdan Kaçınma",
+    "Climate Change": "İlim Değişikliği", "Resource Scarcity": "Kaynak Kıtlığı",
+    "Nesting Site": "Yuvalama Alanı", "Safety": "Güvenlik",
+    "Seasonal Change": "Mevsimsel Değişim", "Food Availability": "Yiyecek Bulunabilirliği",
+    "Water Availability": "Su Bulunabilirliği", "Habitat Loss": "Habitat Kaybı",
+    "Other": "Diğer", "Unknown": "Bilinmeyen"
+}
+
+
+def _source_column(df, column):
+    # Sütun yoksa tüm satırlar için 'Unknown' kabul edelim, böylece hata vermez.
+    if column in df.columns:
+        return df[column]
+    return pd.Series("Unknown", index=df.index, dtype=object)
+
+
+def translate_column(values, mapping, default):
+    # Her benzersiz değer yalnızca bir kez çevrilir. Sonuç satır başına metin tutmayan, alfabetik
+    # sıralı bir kategorik sütundur; kodları kaynak sütunun kodlarından tek bir take ile üretilir.
+    codes, uniques = pd.factorize(values)
+    labels = [mapping.get(u, default) for u in uniques] + [default]
+    categories = sorted(set(labels))
+    position = {label: i for i, label in enumerate(categories)}
+    lookup = np.array([position[label] for label in labels], dtype=np.int32)
+    return pd.Series(pd.Categorical.from_codes(lookup[codes], categories=categories), index=values.index)
+
+
+def translate_months(values):
+    # Ay sütunu sıralı kategorik olarak üretilir; listede olmayan aylar eksik değer olur.
+    codes, uniques = pd.factorize(values.astype(str))
+    position = {month: i for i, month in enumerate(MONTH_ORDER_TR)}
+    lookup = np.array(
+        [position.get(MONTHS_TR.get(u.split(',')[0].strip()), -1) for u in uniques] + [-1],
+        dtype=np.int8
+    )
+    month_codes = lookup[codes]
+    return pd.Series(
+        pd.Categorical.from_codes(month_codes, categories=MONTH_ORDER_TR, ordered=True),
+        index=values.index
+    )
+
+
+# Tabloda tutulacak en büyük mutlak değer (yüzde birlik adımlarla); koordinatlar için fazlasıyla yeterli.
+_LABEL_TABLE_LIMIT = 100_000
+
+
+@lru_cache(maxsize=8)
+def _fixed2_table(prefix, size):
+    positive = np.array([f"{prefix}{c // 100}.{c % 100:02d}" for c in range(size)], dtype=object)
+    negative = np.array([f"{prefix}-{c // 100}.{c % 100:02d}" for c in range(size)], dtype=object)
+    return positive, negative
+
+
+def format_fixed2(values, prefix=""):
+    # f"{x:.2f}" ile birebir aynı çıktıyı satır satır biçimlendirme yapmadan üretir:
+    # değerler yüzde birlik tam sayılara çevrilip önceden biçimlendirilmiş tablodan okunur.
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values)
+    scaled = np.abs(np.where(finite, values, 0.0)) * 100.0
+
+    # .5 sınırına çok yakın değerlerde ikili gösterim yuvarlamayı etkileyebilir;
+    # bu nadir değerler, sonsuz/NaN ve tablo dışı değerler Python biçimlendirmesine bırakılır.
+    # Tablo sınırı tam sayıya çevirmeden önce denetlenir; çok büyük değerler int64'e sığmaz.
+    fallback = ~finite | (np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6) | (scaled >= _LABEL_TABLE_LIMIT - 0.5)
+    in_table = np.rint(np.where(fallback, 0.0, scaled)).astype(np.int64)
+    # Tablo boyutu yuvarlanır ki benzer veri kümeleri aynı önbellek girdisini kullansın.
+    size = (int(in_table.max()) // 4096 + 1) * 4096 if in_table.size else 1
+    positive, negative = _fixed2_table(prefix, size)
+    formatted = np.where(np.signbit(values), negative[in_table], positive[in_table])
+
+    for i in np.flatnonzero(fallback):
+        formatted[i] = f"{prefix}{values[i]:.2f}"
+    return formatted
+
+
+def format_coord_labels(latitudes, longitudes, index=None):
+    labels = format_fixed2(latitudes, "Enlem: ") + format_fixed2(longitudes, ", Boylam: ")
+    return pd.Series(labels, index=index)
+
+
+def add_coord_labels(df):
+    df = df.copy()
+    for label_col, (lat_col, lon_col) in COORD_LABEL_COLUMNS.items():
+        df[label_col] = format_coord_labels(df[lat_col], df[lon_col], index=df.index)
+    return df
+
+
+def downcast_integers(df):
+    # Tam sayı sütunları değer aralığına yetecek en küçük tipe indirilir
+    for col in df.columns:
+        if pd.api.types.is_integer_dtype(df[col].dtype):
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+    return df
+
+
+def memory_report(df):
+    # Sütun başına tip ve gerçek bellek kullanımı (metin ve kategorilerin içeriği dahil)
+    usage = df.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({"dtype": df.dtypes.astype(str), "bytes": usage})
+    report["share"] = report["bytes"] / max(int(usage.sum()), 1)
+    return report.sort_values("bytes", ascending=False)
+
+
+def process_frame(df_input):
+    df = df_input.copy()
+
+    for col in REQUIRED_COORDS:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    df.dropna(subset=POSITION_COLUMNS, inplace=True)
+
+    df['Migration_Start_Month_TR'] = translate_months(_source_column(df, 'Migration_Start_Month'))
+    df['Species_TR'] = translate_column(_source_column(df, 'Species'), SPECIES_TR, "Bilinmeyen Tür")
+    df['Region_TR'] = translate_column(_source_column(df, 'Region'), REGION_TR, "Bilinmeyen Bölge")
+    df['Migration_Reason_TR'] = translate_column(_source_column(df, 'Migration_Reason'), REASON_TR, "Bilinmeyen Neden")
+
+    return downcast_integers(df)
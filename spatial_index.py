@@ -0,0 +1,172 @@
+import numpy as np
+
+# Ortalama Dünya yarıçapı (km)
+EARTH_RADIUS_KM = 6371.0088
+# Izgara hücresinin kenarı (derece); 1M kayıtta hücre başına ortalama ~15 uç nokta düşer
+SPATIAL_CELL_DEGREES = 1.0
+
+# İndekslenen uç noktalar ve koordinat sütunları
+ENDPOINTS = {
+    "start": ("Start_Latitude", "Start_Longitude"),
+    "end": ("End_Latitude", "End_Longitude"),
+}
+# Uç nokta sonuçlarının birleştirilmesi: "either" birleşim, "both" kesişim
+ENDPOINT_MODES = ["either", "start", "end", "both"]
+
+
+def _cell_rows(lat, cell, n_lat):
+    return np.clip(np.floor((np.asarray(lat, dtype=np.float64) + 90.0) / cell), 0, n_lat - 1).astype(np.int64)
+
+
+def _cell_cols(lon, cell, n_lon):
+    return np.clip(np.floor((np.asarray(lon, dtype=np.float64) + 180.0) / cell), 0, n_lon - 1).astype(np.int64)
+
+
+def build_spatial_index(df, cell_degrees=SPATIAL_CELL_DEGREES):
+    # Her uç nokta için satırlar ızgara hücresine göre sıralanır; hücrenin satırları sıralı dizide
+    # bitişik bir aralıktır (offsets). Koordinatlar da aynı sırayla saklanır, böylece sorgular
+    # aday hücreleri bellekte ardışık dilimler olarak okur. Veri kümesi başına bir kez kurulur.
+    n_lat = int(np.ceil(180.0 / cell_degrees))
+    n_lon = int(np.ceil(360.0 / cell_degrees))
+    index = {"n_rows": len(df), "cell": cell_degrees, "n_lat": n_lat, "n_lon": n_lon, "endpoints": {}}
+    for name, (lat_col, lon_col) in ENDPOINTS.items():
+        if lat_col not in df.columns or lon_col not in df.columns:
+            continue
+        lat = df[lat_col].to_numpy()
+        lon = df[lon_col].to_numpy()
+        cells = _cell_rows(lat, cell_degrees, n_lat) * n_lon + _cell_cols(lon, cell_degrees, n_lon)
+        order = np.argsort(cells, kind="stable")
+        index["endpoints"][name] = {
+            "order": order.astype(np.int32 if len(df) < 2 ** 31 else np.int64),
+            "offsets": np.searchsorted(cells[order], np.arange(n_lat * n_lon + 1)),
+            "lat": lat[order],
+            "lon": lon[order],
+        }
+    return index
+
+
+def extend_spatial_index(index, delta_df):
+    # Eklenen satırlar (mevcut satırların ardından gelir) hücrelerine, o hücredeki mevcut satırların sonuna
+    # yerleştirilir; sonuç, tüm veriyle baştan kurulan indeksle aynıdır. Eski indeks değişmez.
+    n_old = index["n_rows"]
+    extended = {**index, "n_rows": n_old + len(delta_df), "endpoints": {}}
+    for name, entry in index["endpoints"].items():
+        lat_col, lon_col = ENDPOINTS[name]
+        lat = delta_df[lat_col].to_numpy()
+        lon = delta_df[lon_col].to_numpy()
+        cells = _cell_rows(lat, index["cell"], index["n_lat"]) * index["n_lon"] + _cell_cols(lon, index["cell"], index["n_lon"])
+        order = np.argsort(cells, kind="stable")
+        sorted_cells = cells[order]
+        # np.insert aynı konuma eklenen değerlerin sırasını korur
+        insert_at = entry["offsets"][sorted_cells + 1]
+        extended["endpoints"][name] = {
+            "order": np.insert(entry["order"], insert_at, (order + n_old).astype(entry["order"].dtype)),
+            "offsets": entry["offsets"] + np.searchsorted(sorted_cells, np.arange(len(entry["offsets"]))),
+            "lat": np.insert(entry["lat"], insert_at, lat[order]),
+            "lon": np.insert(entry["lon"], insert_at, lon[order]),
+        }
+    return extended
+
+
+def _ranges_to_indices(starts, ends):
+    # [start, end) aralıklarını Python döngüsü olmadan tek bir indeks dizisine açar
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    shifts = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return np.arange(total, dtype=np.int64) + shifts
+
+
+def _candidates(index, entry, lat_min, lat_max, lon_ranges):
+    # Kutunun değdiği hücrelerdeki tüm uç noktalar; her enlem satırı ve boylam aralığı tek bir dilimdir
+    rows = np.arange(_cell_rows(lat_min, index["cell"], index["n_lat"]), _cell_rows(lat_max, index["cell"], index["n_lat"]) + 1)
+    starts, ends = [], []
+    for lon_min, lon_max in lon_ranges:
+        c0 = _cell_cols(lon_min, index["cell"], index["n_lon"])
+        c1 = _cell_cols(lon_max, index["cell"], index["n_lon"])
+        starts.append(entry["offsets"][rows * index["n_lon"] + c0])
+        ends.append(entry["offsets"][rows * index["n_lon"] + c1 + 1])
+    return _ranges_to_indices(np.concatenate(starts), np.concatenate(ends))
+
+
+def _lon_ranges(lon_min, lon_max):
+    # lon_min > lon_max ise kutu 180. meridyeni keser ve iki aralığa bölünür
+    if lon_min <= lon_max:
+        return [(lon_min, lon_max)]
+    return [(lon_min, 180.0), (-180.0, lon_max)]
+
+
+def _in_lon_ranges(lon, lon_ranges):
+    mask = np.zeros(len(lon), dtype=bool)
+    for lon_min, lon_max in lon_ranges:
+        mask |= (lon >= lon_min) & (lon <= lon_max)
+    return mask
+
+
+def _combine(index, results, endpoint):
+    # Uç nokta sonuçları satır maskesinde birleştirilir; sıralama/unique gerektirmez ve sonuç sıralı çıkar
+    mask = np.zeros(index["n_rows"], dtype=bool)
+    mask[results[0]] = True
+    if len(results) > 1:
+        other = np.zeros(index["n_rows"], dtype=bool)
+        other[results[1]] = True
+        if endpoint == "both":
+            mask &= other
+        else:
+            mask |= other
+    return np.flatnonzero(mask)
+
+
+def _endpoint_entries(index, endpoint):
+    if endpoint not in ENDPOINT_MODES:
+        raise ValueError(f"Bilinmeyen uç nokta seçimi: {endpoint}")
+    names = ["start", "end"] if endpoint in ("either", "both") else [endpoint]
+    entries = [index["endpoints"][name] for name in names if name in index["endpoints"]]
+    if not entries:
+        raise ValueError("İndekste istenen uç noktanın koordinatları yok.")
+    return entries
+
+
+def query_bbox(index, lat_min, lat_max, lon_min, lon_max, endpoint="either"):
+    # Uç noktası kutunun içinde (sınırlar dahil) kalan satırların sıralı konumları
+    lat_min, lat_max = max(min(lat_min, lat_max), -90.0), min(max(lat_min, lat_max), 90.0)
+    lon_ranges = _lon_ranges(lon_min, lon_max)
+    results = []
+    for entry in _endpoint_entries(index, endpoint):
+        idx = _candidates(index, entry, lat_min, lat_max, lon_ranges)
+        lat = entry["lat"][idx]
+        mask = (lat >= lat_min) & (lat <= lat_max) & _in_lon_ranges(entry["lon"][idx], lon_ranges)
+        results.append(entry["order"][idx[mask]])
+    return _combine(index, results, endpoint)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2.0) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _radius_bbox(lat, lon, radius_km):
+    # Dairenin sınırlayıcı kutusu; daire bir kutbu ya da tüm boylamları kapsıyorsa boylam aralığı tam turdur
+    angular = radius_km / EARTH_RADIUS_KM
+    dlat = np.degrees(angular)
+    lat_min, lat_max = lat - dlat, lat + dlat
+    if lat_min <= -90.0 or lat_max >= 90.0 or angular >= np.pi / 2:
+        return max(lat_min, -90.0), min(lat_max, 90.0), [(-180.0, 180.0)]
+    dlon = np.degrees(np.arcsin(min(np.sin(angular) / np.cos(np.radians(lat)), 1.0)))
+    lon_min = (lon - dlon + 180.0) % 360.0 - 180.0
+    lon_max = (lon + dlon + 180.0) % 360.0 - 180.0
+    return lat_min, lat_max, _lon_ranges(lon_min, lon_max)
+
+
+def query_radius(index, lat, lon, radius_km, endpoint="either"):
+    # Uç noktası merkeze en fazla radius_km uzaklıkta olan satırların sıralı konumları.
+    # Adaylar sınırlayıcı kutudaki hücrelerden alınır, mesafe vektörel haversine ile kesinleştirilir.
+    lat_min, lat_max, lon_ranges = _radius_bbox(lat, lon, radius_km)
+    results = []
+    for entry in _endpoint_entries(index, endpoint):
+        idx = _candidates(index, entry, lat_min, lat_max, lon_ranges)
+        mask = haversine_km(lat, lon, entry["lat"][idx], entry["lon"][idx]) <= radius_km
+        results.append(entry["order"][idx[mask]])
+    return _combine(index, results, endpoint)
@@ -0,0 +1,246 @@
+import argparse
+import json
+import os
+import time
+import uuid
+
+import joblib
+import numpy as np
+import pandas as pd
+
+import dataset_cache
+from model_loader import ACTIVE_MODEL_FILE, model_metadata_path
+from prediction import SCORING_SCHEMA, compile_pipeline, input_data_columns, input_value_maps, to_model_input
+
+# Hedef sütun ve "başarılı" sayılan değer (modelin 1 sınıfı)
+TARGET_COLUMN = 'Migration_Success'
+POSITIVE_VALUE = 'Successful'
+TRAINING_SCHEMA = {**SCORING_SCHEMA, TARGET_COLUMN: 'category'}
+
+# Eğitim örneğinin en fazla satır sayısı; daha büyük dosyalardan akış halinde düzgün rastgele örnek alınır
+DEFAULT_MAX_ROWS = 200_000
+DEFAULT_CHUNKSIZE = 100_000
+DEFAULT_CV_FOLDS = 5
+DEFAULT_TEST_SIZE = 0.2
+# Adaylar en yüksek çapraz doğrulama ROC AUC değerine göre seçilir
+PARAM_GRID = {
+    'classifier__C': [0.01, 0.1, 1.0, 10.0],
+    'classifier__penalty': ['l1', 'l2'],
+    'classifier__class_weight': [None, 'balanced'],
+}
+SAMPLE_KEY = '_sample_key'
+
+
+def read_training_sample(path, max_rows=DEFAULT_MAX_ROWS, chunksize=DEFAULT_CHUNKSIZE, seed=0):
+    # Dosya parça parça okunur; her satıra rastgele bir anahtar verilir ve en küçük anahtarlı max_rows satır
+    # tutulur. Sonuç, dosyanın tamamından alınmış düzgün bir örnektir ve bellekte en fazla max_rows + bir
+    # parça kadar satır bulunur. max_rows None ise tüm satırlar kullanılır.
+    rng = np.random.default_rng(seed)
+    sample = None
+    rows_read = 0
+    reader = pd.read_csv(
+        path,
+        usecols=lambda col: col in TRAINING_SCHEMA,
+        dtype={col: dtype for col, dtype in TRAINING_SCHEMA.items() if dtype != 'float64'},
+        chunksize=chunksize,
+    )
+    with reader:
+        for chunk in reader:
+            rows_read += len(chunk)
+            chunk[SAMPLE_KEY] = rng.random(len(chunk))
+            sample = chunk if sample is None else pd.concat([sample, chunk], ignore_index=True)
+            if max_rows is not None and len(sample) > max_rows:
+                sample = sample.nsmallest(max_rows, SAMPLE_KEY)
+    if sample is None:
+        raise ValueError("Eğitim dosyasında kayıt bulunamadı.")
+    return sample.drop(columns=SAMPLE_KEY).reset_index(drop=True), rows_read
+
+
+def training_frame(sample):
+    # Model girdileri ve hedef; girdisi ya da sonucu eksik satırlar eğitimde kullanılmaz
+    if TARGET_COLUMN not in sample.columns:
+        raise ValueError(f"Eğitim için '{TARGET_COLUMN}' sütunu gerekli.")
+    X = to_model_input(sample)
+    target = sample[TARGET_COLUMN]
+    complete = (X.notna().all(axis=1) & target.notna()).to_numpy()
+    y = (target[complete] == POSITIVE_VALUE).to_numpy(dtype=np.int64)
+    return X[complete].reset_index(drop=True), y
+
+
+def build_pipeline(seed=42):
+    # Uygulamayla gelen modelle aynı yapı: sayısal girdiler ölçeklenir, kategorikler one-hot kodlanır
+    from sklearn.compose import ColumnTransformer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    categorical = [col for col in input_data_columns if col in input_value_maps]
+    numeric = [col for col in input_data_columns if col not in input_value_maps]
+    preprocessor = ColumnTransformer(transformers=[
+        ('num', StandardScaler(), numeric),
+        ('cat', OneHotEncoder(handle_unknown='ignore', sparse_output=False), categorical),
+    ])
+    classifier = LogisticRegression(max_iter=200, random_state=seed, solver='liblinear')
+    return Pipeline(steps=[('preprocessor', preprocessor), ('classifier', classifier)])
+
+
+def evaluate(pipeline, X, y):
+    from sklearn.metrics import accuracy_score, brier_score_loss, log_loss, roc_auc_score
+
+    probabilities = pipeline.predict_proba(X)[:, 1]
+    return {
+        'rows': len(y),
+        'accuracy': float(accuracy_score(y, (probabilities > 0.5).astype(np.int64))),
+        'roc_auc': float(roc_auc_score(y, probabilities)),
+        'log_loss': float(log_loss(y, probabilities, labels=[0, 1])),
+        'brier': float(brier_score_loss(y, probabilities)),
+    }
+
+
+def train(X, y, cv_folds=DEFAULT_CV_FOLDS, test_size=DEFAULT_TEST_SIZE, n_jobs=-1, seed=42):
+    # Hiperparametre araması ve çapraz doğrulama, joblib'in süreç havuzunda (loky) tüm çekirdeklere
+    # dağıtılır; her aday × katman ayrı bir süreçte eğitilir. Ayrılan test kümesi yalnızca son ölçüm içindir.
+    from sklearn.model_selection import GridSearchCV, StratifiedKFold, train_test_split
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, stratify=y, random_state=seed)
+    search = GridSearchCV(
+        build_pipeline(seed),
+        PARAM_GRID,
+        scoring={'roc_auc': 'roc_auc', 'accuracy': 'accuracy', 'neg_log_loss': 'neg_log_loss'},
+        refit='roc_auc',
+        cv=StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=seed),
+        n_jobs=n_jobs,
+    )
+    start = time.perf_counter()
+    search.fit(X_train, y_train)
+    search_seconds = time.perf_counter() - start
+
+    results = search.cv_results_
+    candidates = [
+        {
+            'params': {name.removeprefix('classifier__'): value for name, value in params.items()},
+            'roc_auc': float(results['mean_test_roc_auc'][i]),
+            'roc_auc_std': float(results['std_test_roc_auc'][i]),
+            'accuracy': float(results['mean_test_accuracy'][i]),
+            'log_loss': float(-results['mean_test_neg_log_loss'][i]),
+            'fit_seconds': float(results['mean_fit_time'][i]),
+        }
+        for i, params in enumerate(results['params'])
+    ]
+    report = {
+        'params': {name.removeprefix('classifier__'): value for name, value in search.best_params_.items()},
+        'cv': {
+            'folds': cv_folds,
+            'scoring': 'roc_auc',
+            'best_score': float(search.best_score_),
+            'candidates': sorted(candidates, key=lambda c: -c['roc_auc']),
+        },
+        'train_rows': len(y_train),
+        'test_metrics': evaluate(search.best_estimator_, X_test, y_test),
+        'search_seconds': search_seconds,
+    }
+    return search.best_estimator_, report
+
+
+def _write_atomic(path, write, overwrite=True):
+    # Uygulama dosyayı yazılırken okumasın diye önce geçici dosyaya yazılır. overwrite=False ise dosya
+    # hard link ile yerine konur; aynı adlı dosya varsa FileExistsError verir, mevcut dosya değişmez.
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        write(tmp_path)
+        if overwrite:
+            os.replace(tmp_path, path)
+        else:
+            os.link(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def save_artifact(pipeline, metadata, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"migration_model_{metadata['version']}.pkl")
+    _write_atomic(path, lambda tmp: joblib.dump(pipeline, tmp), overwrite=False)
+    metadata = {**metadata, 'artifact': os.path.basename(path)}
+
+    def write_metadata(tmp):
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+    _write_atomic(model_metadata_path(path), write_metadata, overwrite=False)
+    return path
+
+
+def publish(path, version):
+    # Çalışan uygulama bir sonraki yeniden çalıştırmada yeni modele geçer (bkz. model_loader.active_model)
+    pointer_dir = os.path.dirname(ACTIVE_MODEL_FILE)
+    os.makedirs(pointer_dir, exist_ok=True)
+
+    def write_pointer(tmp):
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'path': os.path.relpath(path, pointer_dir), 'version': version}, f)
+    _write_atomic(ACTIVE_MODEL_FILE, write_pointer)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="9 özellikli göç başarısı modelini bir göç CSV'sinden yeniden eğitir.")
+    parser.add_argument('csv', help="eğitim verisi (göç CSV şeması, 'Migration_Success' sütunu dahil)")
+    parser.add_argument('--output-dir', default='models', help="sürümlü model dosyalarının yazılacağı dizin")
+    parser.add_argument('--max-rows', type=int, default=DEFAULT_MAX_ROWS,
+                        help="eğitim örneğinin en fazla satır sayısı (0: tüm satırlar)")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--cv', type=int, default=DEFAULT_CV_FOLDS, help="çapraz doğrulama katman sayısı")
+    parser.add_argument('--test-size', type=float, default=DEFAULT_TEST_SIZE)
+    parser.add_argument('--jobs', type=int, default=-1, help="paralel süreç sayısı (-1: tüm çekirdekler)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--publish', action='store_true', help="eğitilen modeli uygulamanın kullandığı model yap")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    sample, rows_read = read_training_sample(args.csv, args.max_rows or None, args.chunksize, args.seed)
+    X, y = training_frame(sample)
+    read_seconds = time.perf_counter() - start
+    print(f"{rows_read:,} satır okundu, {len(y):,} satırla eğitiliyor ({read_seconds:.1f} sn).")
+
+    pipeline, report = train(X, y, args.cv, args.test_size, args.jobs, args.seed)
+    # Uygulama modeli NumPy skorlayıcıya derleyerek kullanır; derlenemeyen model sklearn yoluyla çalışır
+    compiled = compile_pipeline(pipeline) is not None
+
+    with open(args.csv, 'rb') as f:
+        source_fingerprint = dataset_cache.fingerprint_upload(f)
+    import sklearn
+
+    metadata = {
+        # Aynı saniyede başlatılan eğitimler birbirinin dosyalarını ezmesin diye rastgele bir sonek eklenir
+        'version': f"{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}-{uuid.uuid4().hex[:8]}",
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'features': input_data_columns,
+        'target': {'column': TARGET_COLUMN, 'positive': POSITIVE_VALUE},
+        'source': {
+            'file': os.path.basename(args.csv),
+            'fingerprint': source_fingerprint,
+            'rows_read': rows_read,
+            'rows_sampled': len(sample),
+            'rows_used': len(y),
+        },
+        **report,
+        'compiled': compiled,
+        'read_seconds': read_seconds,
+        'total_seconds': time.perf_counter() - start,
+        'n_jobs': args.jobs,
+        'cpu_count': os.cpu_count(),
+        'sklearn_version': sklearn.__version__,
+    }
+    path = save_artifact(pipeline, metadata, args.output_dir)
+
+    metrics = report['test_metrics']
+    print(f"En iyi parametreler: {report['params']} (CV ROC AUC {report['cv']['best_score']:.4f}, "
+          f"arama {report['search_seconds']:.1f} sn)")
+    print(f"Test: ROC AUC {metrics['roc_auc']:.4f}, doğruluk {metrics['accuracy']:.4f}, log loss {metrics['log_loss']:.4f}")
+    print(f"Model kaydedildi: {path}")
+    if args.publish:
+        publish(path, metadata['version'])
+        print(f"Uygulamanın kullandığı model güncellendi ({ACTIVE_MODEL_FILE}).")
+
+
+if __name__ == '__main__':
+    main()